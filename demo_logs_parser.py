@@ -5,11 +5,19 @@ Provides beautiful visualization of parallel execution
 """
 
 import json
+import os
 import re
 import sys
+from collections import deque
 from datetime import datetime
 from typing import Dict, Optional
 
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 # ANSI color codes
 COLORS = {
     'red': '\033[91m',
@@ -24,132 +32,201 @@ COLORS = {
     'dim': '\033[2m'
 }
 
+# Frequently used sequences as plain module constants
+RESET = COLORS['reset']
+BOLD = COLORS['bold']
+RED = COLORS['red']
+AUTH_EXPIRED_MSG = f"{COLORS['yellow']}⚠️  Auth token expired (non-critical){RESET}"
+
+# Patterns compiled once at import instead of per log line. The text-log
+# patterns match raw bytes so dropped lines are never decoded; they are
+# case-sensitive and run against a lower-cased copy, since bytes.lower() plus
+# a plain search is several times faster than an re.I scan.
+_PR_NUM = re.compile(r'#(\d+)')
+_AT_FILE = re.compile(r'at: (.+)$')
+_PROGRESS = re.compile(rb'analyzing|scanning|processing|building')
+_SUCCESS = re.compile(rb'complete|success|done|finished')
+_FILEOP = re.compile(rb'created|modified')
+# A JSON record can only produce output if it is an assistant message, a
+# tool result or carries a result key; records mentioning none are skipped
+# without decoding
+_JSON_INTEREST = re.compile(rb'"(?:assistant|tool_result|result)"')
+# Union of the keyword buckets above, used to reject most lines in one scan
+_ANY_KEYWORD = re.compile(
+    rb'analyzing|scanning|processing|building|complete|success|done|finished|created|modified'
+)
+
+# Most bytes taken from stdin per read; output is flushed after each read
+READ_SIZE = 65536
+
+# Number of recently created files kept for the summary
+RECENT_FILES = 16
+
+# Message formatters for tool_use events, keyed by tool name
+_TOOL_FMT = {
+    'Write': lambda inp: f"📝 Writing: {inp.get('file_path', '')}",
+    'Read': lambda inp: f"👁️  Reading: {inp.get('file_path', '')}",
+    'Bash': lambda inp: f"⚡ Running: {str(inp.get('command', ''))[:50]}...",
+    'TodoWrite': lambda inp: "📋 Updating task list",
+}
+
 class ClaudeLogParser:
     def __init__(self, worker_name: str, color: str = 'white'):
         self.worker_name = worker_name
         self.color = COLORS.get(color, COLORS['white'])
+        # Resolve the bold variant once rather than per formatted line
+        self._bold_color = BOLD + self.color
         self.current_tool = None
-        self.files_created = []
+        # Only the tail is shown in the summary, so keep a bounded window
+        # plus a running total instead of every filename
+        self.files_created = deque(maxlen=RECENT_FILES)
+        self.files_created_count = 0
         self.files_modified = []
         self.tests_run = 0
         self.tests_passed = 0
         
-    def parse_line(self, line: str) -> Optional[str]:
-        """Parse a log line and return formatted output"""
-        try:
-            # Try to parse as JSON
-            if line.strip().startswith('{'):
-                data = json.loads(line)
-                return self.parse_json_log(data)
-        except:
-            # Fall back to text parsing
-            return self.parse_text_log(line)
+    def parse_line(self, line: bytes) -> Optional[str]:
+        """Parse a raw log line and return formatted output"""
+        # Only lines opening with '{' are JSON candidates; the common case
+        # has no leading whitespace so skip the lstrip() copy for it
+        if line[:1] == b'{' or line.lstrip()[:1] == b'{':
+            # Skip lines that produce no output either way: not an
+            # interesting JSON record, and nothing the text fallback (used
+            # if the line turns out not to be JSON) would report
+            if (not _JSON_INTEREST.search(line) and b'ERROR' not in line
+                    and not _ANY_KEYWORD.search(line.lower())):
+                return None
+            try:
+                data = _loads(line)
+            except ValueError:
+                # Not valid JSON (or not valid utf-8); fall back to text parsing
+                return self.parse_text_log(line)
+            return self.parse_json_log(data)
+        return self.parse_text_log(line)
     
     def parse_json_log(self, data: Dict) -> Optional[str]:
         """Parse JSON structured logs"""
         msg_type = data.get('type', '')
         
-        if msg_type == 'user' and 'tool_result' in str(data):
+        if msg_type == 'user' and _has_tool_result(data):
             # Tool result
-            content = data.get('message', {}).get('content', [])
-            if content and isinstance(content[0], dict):
-                result = content[0].get('content', '')
+            content = data['message']['content']
+            result = content[0].get('content') if isinstance(content[0], dict) else None
+            if isinstance(result, str):
                 if 'created successfully' in result:
-                    file_match = re.search(r'at: (.+)$', result)
+                    file_match = _AT_FILE.search(result)
                     if file_match:
                         filename = file_match.group(1)
                         self.files_created.append(filename)
-                        return f"{self.color}✓ Created: {filename}{COLORS['reset']}"
+                        self.files_created_count += 1
+                        return f"{self.color}✓ Created: {filename}{RESET}"
                 elif 'updated' in result:
-                    return f"{self.color}✓ Updated file{COLORS['reset']}"
+                    return f"{self.color}✓ Updated file{RESET}"
                 elif 'Tool ran without output' in result:
-                    return f"{self.color}✓ Command executed{COLORS['reset']}"
+                    return f"{self.color}✓ Command executed{RESET}"
         
         elif msg_type == 'assistant':
             # Claude's actions
-            message = data.get('message', {})
-            if 'content' in message:
-                for content in message.get('content', []):
+            message = data.get('message')
+            contents = message.get('content') if isinstance(message, dict) else None
+            if isinstance(contents, list):
+                for content in contents:
+                    if not isinstance(content, dict):
+                        continue
                     if content.get('type') == 'tool_use':
                         tool_name = content.get('name', 'unknown')
                         self.current_tool = tool_name
                         
                         # Format based on tool
-                        if tool_name == 'Write':
-                            inp = content.get('input', {})
-                            file_path = inp.get('file_path', '')
-                            return f"{self.color}📝 Writing: {file_path}{COLORS['reset']}"
-                        elif tool_name == 'Read':
-                            inp = content.get('input', {})
-                            file_path = inp.get('file_path', '')
-                            return f"{self.color}👁️  Reading: {file_path}{COLORS['reset']}"
-                        elif tool_name == 'Bash':
-                            inp = content.get('input', {})
-                            cmd = inp.get('command', '')[:50]
-                            return f"{self.color}⚡ Running: {cmd}...{COLORS['reset']}"
-                        elif tool_name == 'TodoWrite':
-                            return f"{self.color}📋 Updating task list{COLORS['reset']}"
-                        else:
-                            return f"{self.color}🔧 Using: {tool_name}{COLORS['reset']}"
+                        fmt = _TOOL_FMT.get(tool_name) if isinstance(tool_name, str) else None
+                        if fmt and isinstance(content.get('input', {}), dict):
+                            return f"{self.color}{fmt(content.get('input', {}))}{RESET}"
+                        return f"{self.color}🔧 Using: {tool_name}{RESET}"
                     
                     elif content.get('type') == 'text':
                         text = content.get('text', '')
+                        if not isinstance(text, str):
+                            continue
                         # Extract key phrases
                         if 'test' in text.lower() and 'pass' in text.lower():
                             self.tests_passed += 1
-                            return f"{self.color}✅ Tests passing!{COLORS['reset']}"
+                            return f"{self.color}✅ Tests passing!{RESET}"
                         elif 'created' in text.lower() and 'successfully' in text.lower():
-                            return f"{self.color}✓ Task completed{COLORS['reset']}"
+                            return f"{self.color}✓ Task completed{RESET}"
         
         elif 'result' in data:
             # Session result
             result = data.get('result', '')
+            if not isinstance(result, str):
+                return None
             if 'Created PR' in result or 'pull request' in result.lower():
-                pr_match = re.search(r'#(\d+)', result)
+                pr_match = _PR_NUM.search(result)
                 if pr_match:
                     pr_num = pr_match.group(1)
-                    return f"{COLORS['bold']}{self.color}🎉 Created PR #{pr_num}!{COLORS['reset']}"
+                    return f"{self._bold_color}🎉 Created PR #{pr_num}!{RESET}"
         
         return None
     
-    def parse_text_log(self, line: str) -> Optional[str]:
-        """Parse plain text logs"""
+    def parse_text_log(self, line: bytes) -> Optional[str]:
+        """Parse plain text logs
+        
+        Filters run on the raw bytes; the line is only decoded once it is
+        known to produce output.
+        """
+        line = line.strip()
         # Skip empty lines
-        if not line.strip():
+        if not line:
             return None
         
         # ERROR lines
-        if 'ERROR' in line:
-            if 'OAuth token has expired' in line:
-                return f"{COLORS['yellow']}⚠️  Auth token expired (non-critical){COLORS['reset']}"
+        if b'ERROR' in line:
+            if b'OAuth token has expired' in line:
+                return AUTH_EXPIRED_MSG
             else:
-                return f"{COLORS['red']}❌ Error: {line.strip()}{COLORS['reset']}"
+                return f"{RED}❌ Error: {_decode(line)}{RESET}"
+        
+        # Most lines match no keyword bucket; rule them out in one pass
+        lowered = line.lower()
+        if not _ANY_KEYWORD.search(lowered):
+            return None
         
         # Progress indicators
-        if any(word in line.lower() for word in ['analyzing', 'scanning', 'processing', 'building']):
-            return f"{self.color}⟳ {line.strip()}{COLORS['reset']}"
+        if _PROGRESS.search(lowered):
+            return f"{self.color}⟳ {_decode(line)}{RESET}"
         
         # Success indicators
-        if any(word in line.lower() for word in ['complete', 'success', 'done', 'finished']):
-            return f"{COLORS['bold']}{self.color}✓ {line.strip()}{COLORS['reset']}"
+        if _SUCCESS.search(lowered):
+            return f"{self._bold_color}✓ {_decode(line)}{RESET}"
         
         # File operations
-        if 'created' in line.lower() or 'modified' in line.lower():
-            return f"{self.color}📄 {line.strip()}{COLORS['reset']}"
+        if _FILEOP.search(lowered):
+            return f"{self.color}📄 {_decode(line)}{RESET}"
         
         return None
     
     def get_summary(self) -> str:
         """Get execution summary"""
-        summary = f"\n{COLORS['bold']}{self.color}═══ {self.worker_name} Summary ═══{COLORS['reset']}\n"
-        if self.files_created:
-            summary += f"{self.color}Files created: {len(self.files_created)}{COLORS['reset']}\n"
-            for f in self.files_created[-3:]:  # Show last 3
+        summary = f"\n{self._bold_color}═══ {self.worker_name} Summary ═══{RESET}\n"
+        if self.files_created_count:
+            summary += f"{self.color}Files created: {self.files_created_count}{RESET}\n"
+            for f in list(self.files_created)[-3:]:  # Show last 3
                 summary += f"  - {f}\n"
         if self.tests_passed:
-            summary += f"{self.color}Tests passed: {self.tests_passed}{COLORS['reset']}\n"
+            summary += f"{self.color}Tests passed: {self.tests_passed}{RESET}\n"
         return summary
 
+def _has_tool_result(data: Dict) -> bool:
+    """Check whether a message carries a tool_result content block"""
+    message = data.get('message')
+    content = message.get('content') if isinstance(message, dict) else None
+    if not isinstance(content, list):
+        return False
+    return any(isinstance(c, dict) and c.get('type') == 'tool_result' for c in content)
+
+def _decode(line: bytes) -> str:
+    """Decode a raw log line, tolerating invalid utf-8"""
+    return line.decode('utf-8', 'replace')
+
 def main():
     """Main entry point for log parsing"""
     if len(sys.argv) < 3:
@@ -162,21 +239,47 @@ def main():
     parser = ClaudeLogParser(worker_name, color)
     
     # Print header
-    print(f"{COLORS['bold']}{COLORS[color]}{'═' * 50}{COLORS['reset']}")
-    print(f"{COLORS['bold']}{COLORS[color]}{worker_name:^50}{COLORS['reset']}")
-    print(f"{COLORS['bold']}{COLORS[color]}{'═' * 50}{COLORS['reset']}")
+    header_color = BOLD + COLORS[color]
+    print(f"{header_color}{'═' * 50}{RESET}")
+    print(f"{header_color}{worker_name:^50}{RESET}")
+    print(f"{header_color}{'═' * 50}{RESET}")
     print()
     
+    # Batch writes instead of flushing on every line; a terminal stdout is
+    # line-buffered by default, which would flush on each newline
+    out = sys.stdout
+    out.reconfigure(line_buffering=False)
+    # Bind the per-line calls to locals to skip attribute lookups in the loop
+    parse_line = parser.parse_line
+    write = out.write
+    fd = sys.stdin.buffer.fileno()
+    partial = b''
+    
     try:
-        # Read from stdin (piped from docker logs)
-        for line in sys.stdin:
-            formatted = parser.parse_line(line)
+        # Read raw bytes from stdin (piped from docker logs). os.read returns
+        # whatever is available, so each read holds the lines that arrived
+        # together and flushing after it never holds back output while idle
+        while True:
+            chunk = os.read(fd, READ_SIZE)
+            if not chunk:
+                break
+            lines = (partial + chunk).split(b'\n')
+            # The last piece is an incomplete line (empty if chunk ended one)
+            partial = lines.pop()
+            for line in lines:
+                formatted = parse_line(line)
+                if formatted:
+                    write(formatted + '\n')
+            out.flush()
+        if partial:
+            formatted = parse_line(partial)
             if formatted:
-                print(formatted)
-                sys.stdout.flush()
+                write(formatted + '\n')
     except KeyboardInterrupt:
         # Print summary on exit
         print(parser.get_summary())
+    finally:
+        out.flush()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -9,7 +9,7 @@ import json
 import os
 import time
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
 import httpx
 from rich.console import Console
 from rich.layout import Layout
@@ -20,17 +20,71 @@ from rich.table import Table
 from rich.text import Text
 from dotenv import load_dotenv
 
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+# HTTP/2 support in httpx needs the optional h2 package
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 # Load environment variables
 load_dotenv()
 
 console = Console()
 
+# Statuses after which a session is no longer polled
+TERMINAL_STATUSES = ("completed", "failed")
+
+# Rich style for each session status
+STATUS_COLORS = {
+    "pending": "yellow",
+    "initializing": "cyan",
+    "running": "green",
+    "completed": "green bold",
+    "failed": "red",
+    "queued": "yellow"
+}
+
 class SessionMonitor:
     def __init__(self):
         self.api_url = os.getenv("CLAUDE_HUB_API_URL", "https://claude.jonathanflatt.org/api/webhooks/claude")
         self.auth_token = os.getenv("CLAUDE_WEBHOOK_SECRET", "")
         self.sessions: Dict[str, dict] = {}
-        self.client = httpx.AsyncClient(timeout=30.0)
+        # session_id -> (render key, Panel); panels are rebuilt only when the
+        # fields they display change
+        self._panel_cache: Dict[str, tuple] = {}
+        # The header never changes, so build it once
+        self._header = Panel(
+            Text.from_markup(
+                "[bold cyan]MCP Claude Hub - Parallel Session Monitor[/]\n"
+                "[yellow]Orchestrating Multiple Claude Sessions in Real-Time[/]",
+                justify="center"
+            ),
+            style="cyan"
+        )
+        self._waiting_panel = Panel("[dim]Waiting for session...[/]", border_style="dim")
+        # The layout tree is built once; each refresh only swaps slot panels
+        self._layout = self._build_layout()
+        self._slot_panels: List[Optional[Panel]] = [None] * 4
+        # Status checks for all sessions go out together each tick, so keep
+        # enough warm connections around to serve them in parallel. The auth
+        # headers are identical for every request, so set them once here.
+        self.client = httpx.AsyncClient(
+            timeout=30.0,
+            headers={
+                "Authorization": f"Bearer {self.auth_token}",
+                "Content-Type": "application/json"
+            },
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=16, max_keepalive_connections=16)
+        )
     
     async def create_orchestration(self):
         """Create an orchestration with 4 parallel tasks"""
@@ -65,12 +119,7 @@ class SessionMonitor:
             }
         }
         
-        headers = {
-            "Authorization": f"Bearer {self.auth_token}",
-            "Content-Type": "application/json"
-        }
-        
-        response = await self.client.post(self.api_url, json=payload, headers=headers)
+        response = await self.client.post(self.api_url, content=_dumps(payload))
         return response.json()
     
     async def get_session_status(self, session_id: str):
@@ -80,12 +129,7 @@ class SessionMonitor:
             "sessionId": session_id
         }
         
-        headers = {
-            "Authorization": f"Bearer {self.auth_token}",
-            "Content-Type": "application/json"
-        }
-        
-        response = await self.client.post(self.api_url, json=payload, headers=headers)
+        response = await self.client.post(self.api_url, content=_dumps(payload))
         data = response.json()
         
         if "results" in data and data["results"]:
@@ -99,27 +143,30 @@ class SessionMonitor:
         status = session_data.get("status", "unknown")
         session_type = session_data.get("type", "unknown")
         project = session_data.get("project", {})
+        output = session_data.get("output", {})
         
-        # Status colors
-        status_colors = {
-            "pending": "yellow",
-            "initializing": "cyan",
-            "running": "green",
-            "completed": "green bold",
-            "failed": "red",
-            "queued": "yellow"
-        }
+        # Reuse the cached panel if nothing it displays has changed
+        key = (
+            status,
+            session_type,
+            project.get("requirements"),
+            output.get("summary") if output else None,
+            len(output.get("filesCreated") or ()) if output else 0,
+            tuple(str(a) for a in (output.get("artifacts") or [])[:2]) if output else ()
+        )
+        cached = self._panel_cache.get(session_id)
+        if cached and cached[0] == key:
+            return cached[1]
         
         # Create content
         content = []
         content.append(f"[bold]Type:[/bold] {session_type.upper()}")
-        content.append(f"[bold]Status:[/bold] [{status_colors.get(status, 'white')}]{status}[/]")
+        content.append(f"[bold]Status:[/bold] [{STATUS_COLORS.get(status, 'white')}]{status}[/]")
         content.append("")
         content.append(f"[bold]Requirements:[/bold]")
         content.append(project.get("requirements", "N/A")[:100] + "...")
         
         # Add output if completed
-        output = session_data.get("output", {})
         if output:
             content.append("")
             content.append("[bold]Output:[/bold]")
@@ -140,32 +187,24 @@ class SessionMonitor:
             content.append("[green]✓ Complete![/]")
         
         panel_title = f"Session {session_id[:8]}"
-        panel_color = status_colors.get(status, "white")
+        panel_color = STATUS_COLORS.get(status, "white")
         
-        return Panel(
+        panel = Panel(
             "\n".join(content),
             title=panel_title,
             border_style=panel_color,
             expand=True
         )
+        self._panel_cache[session_id] = (key, panel)
+        return panel
     
-    def create_dashboard(self) -> Layout:
-        """Create the dashboard layout"""
+    def _build_layout(self) -> Layout:
+        """Build the dashboard layout skeleton"""
         layout = Layout(name="root")
         
-        # Create header
-        header = Panel(
-            Text.from_markup(
-                "[bold cyan]MCP Claude Hub - Parallel Session Monitor[/]\n"
-                "[yellow]Orchestrating Multiple Claude Sessions in Real-Time[/]",
-                justify="center"
-            ),
-            style="cyan"
-        )
-        
         # Create main grid
         layout.split(
-            Layout(header, size=4),
+            Layout(self._header, size=4),
             Layout(name="main")
         )
         
@@ -185,19 +224,33 @@ class SessionMonitor:
             Layout(name="session4")
         )
         
-        # Add session panels
-        session_ids = list(self.sessions.keys())
-        for i, session_id in enumerate(session_ids[:4]):
-            panel = self.create_session_panel(session_id, self.sessions[session_id])
-            layout[f"session{i+1}"].update(panel)
+        return layout
+    
+    def create_dashboard(self) -> Layout:
+        """Refresh the session slots of the dashboard layout"""
+        session_ids = list(self.sessions.keys())[:4]
+        panels = [
+            self.create_session_panel(session_id, self.sessions[session_id])
+            for session_id in session_ids
+        ]
         
         # Fill empty slots
-        for i in range(len(session_ids), 4):
-            layout[f"session{i+1}"].update(
-                Panel("[dim]Waiting for session...[/]", border_style="dim")
-            )
+        panels.extend([self._waiting_panel] * (4 - len(panels)))
         
-        return layout
+        # Only touch slots whose panel actually changed
+        for i, panel in enumerate(panels):
+            if self._slot_panels[i] is not panel:
+                self._layout[f"session{i+1}"].update(panel)
+                self._slot_panels[i] = panel
+        
+        return self._layout
+    
+    def _active_session_ids(self) -> List[str]:
+        """IDs of sessions that have not reached a terminal status"""
+        return [
+            session_id for session_id, session in self.sessions.items()
+            if session.get("status") not in TERMINAL_STATUSES
+        ]
     
     async def monitor_sessions(self):
         """Monitor sessions and update display"""
@@ -215,25 +268,24 @@ class SessionMonitor:
                         for session in result["data"]["sessions"]:
                             self.sessions[session["id"]] = session
             
-            # Monitor until all complete
-            while True:
-                all_complete = True
-                
-                # Update each session
-                for session_id in list(self.sessions.keys()):
-                    session_data = await self.get_session_status(session_id)
+            # Monitor until all complete. Finished sessions never change
+            # again, so only the ones still in flight are polled.
+            session_ids = self._active_session_ids()
+            while session_ids:
+                # Update active sessions concurrently
+                statuses = await asyncio.gather(
+                    *(self.get_session_status(session_id) for session_id in session_ids)
+                )
+                for session_id, session_data in zip(session_ids, statuses):
                     if session_data:
                         self.sessions[session_id] = session_data
-                        if session_data.get("status") not in ["completed", "failed"]:
-                            all_complete = False
                 
                 # Update display
                 live.update(self.create_dashboard())
                 
-                if all_complete:
-                    break
-                
-                await asyncio.sleep(2)
+                session_ids = self._active_session_ids()
+                if session_ids:
+                    await asyncio.sleep(2)
         
         console.print("\n[green bold]All sessions complete![/]")
 
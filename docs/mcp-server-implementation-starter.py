@@ -10,6 +10,7 @@ Requirements:
 
 import os
 import asyncio
+import random
 from typing import Dict, List, Optional, Any
 import httpx
 from gradio_mcp import MCPServer
@@ -19,6 +20,45 @@ import json
 # Load environment variables
 load_dotenv()
 
+# Read-only events are retried on transient errors; creating or starting a
+# session is not, since a retry could repeat it
+RETRYABLE_EVENTS = {"session.get", "session.output", "session.list"}
+MAX_ATTEMPTS = 5
+RETRY_INITIAL_DELAY = 1.0
+RETRY_MAX_DELAY = 10.0
+
+
+class ClaudeHubError(Exception):
+    """Base class for errors reported by the Claude Hub API"""
+
+
+class TransientError(ClaudeHubError):
+    """Timeouts, connection failures, 429 and 5xx responses; worth retrying"""
+
+
+class PermanentError(ClaudeHubError):
+    """4xx responses and rejected requests; retrying will not help"""
+
+
+class SessionNotFound(PermanentError):
+    """The requested session does not exist"""
+
+
+def _classify_http_error(e: httpx.HTTPError) -> ClaudeHubError:
+    """Map an httpx error onto the ClaudeHubError hierarchy"""
+    message = f"API request failed: {str(e)}"
+    if isinstance(e, httpx.HTTPStatusError):
+        status_code = e.response.status_code
+        if status_code == 429 or status_code >= 500:
+            return TransientError(message)
+        if status_code == 404:
+            return SessionNotFound(message)
+        return PermanentError(message)
+    if isinstance(e, httpx.TransportError):
+        return TransientError(message)
+    return PermanentError(message)
+
+
 class ClaudeOrchestrationMCP:
     """MCP Server for orchestrating Claude Code sessions"""
     
@@ -28,25 +68,35 @@ class ClaudeOrchestrationMCP:
         self.client = httpx.AsyncClient(timeout=30.0)
         
     async def _make_request(self, payload: Dict[str, Any]) -> Dict[str, Any]:
-        """Make authenticated request to Claude Hub API"""
+        """Make authenticated request to Claude Hub API
+        
+        Raises TransientError or PermanentError when the request fails.
+        Read-only events are retried with jittered exponential backoff while
+        the error is transient.
+        """
         headers = {
             "Authorization": f"Bearer {self.auth_token}",
             "Content-Type": "application/json"
         }
+        attempts = MAX_ATTEMPTS if payload.get("type") in RETRYABLE_EVENTS else 1
+        delay = RETRY_INITIAL_DELAY
         
-        try:
-            response = await self.client.post(
-                self.api_url,
-                json=payload,
-                headers=headers
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            return {
-                "error": f"API request failed: {str(e)}",
-                "success": False
-            }
+        for attempt in range(1, attempts + 1):
+            try:
+                response = await self.client.post(
+                    self.api_url,
+                    json=payload,
+                    headers=headers
+                )
+                response.raise_for_status()
+                return response.json()
+            except httpx.HTTPError as e:
+                error = _classify_http_error(e)
+                if not isinstance(error, TransientError) or attempt == attempts:
+                    raise error from e
+            
+            await asyncio.sleep(random.uniform(0, delay))
+            delay = min(delay * 2, RETRY_MAX_DELAY)
     
     async def create_session(
         self,
@@ -82,7 +132,7 @@ class ClaudeOrchestrationMCP:
                 "container_id": session.get("containerId")
             }
         else:
-            raise Exception(result.get("error", "Failed to create session"))
+            raise PermanentError(result.get("error", "Failed to create session"))
     
     async def start_session(self, session_id: str) -> Dict[str, Any]:
         """Start a previously created session"""
@@ -102,7 +152,7 @@ class ClaudeOrchestrationMCP:
                 "message": data.get("message", "Session start requested")
             }
         else:
-            raise Exception(result.get("error", "Failed to start session"))
+            raise PermanentError(result.get("error", "Failed to start session"))
     
     async def get_session_status(self, session_id: str) -> Dict[str, Any]:
         """Get the current status of a session"""
@@ -126,7 +176,7 @@ class ClaudeOrchestrationMCP:
                 "container_id": session.get("containerId")
             }
         else:
-            raise Exception(result.get("error", "Failed to get session status"))
+            raise PermanentError(result.get("error", "Failed to get session status"))
     
     async def get_session_output(self, session_id: str) -> Dict[str, Any]:
         """Get the output from a completed session"""
@@ -146,7 +196,7 @@ class ClaudeOrchestrationMCP:
                 "output": data.get("output", {})
             }
         else:
-            raise Exception(result.get("error", "Failed to get session output"))
+            raise PermanentError(result.get("error", "Failed to get session output"))
     
     async def list_sessions(
         self, 
@@ -161,6 +211,11 @@ class ClaudeOrchestrationMCP:
         
         if orchestration_id:
             payload["orchestrationId"] = orchestration_id
+        
+        # Let the API filter by status where it supports it; the filter is
+        # still applied below, since session.list only defines orchestrationId
+        if status and status != "all":
+            payload["status"] = status
             
         result = await self._make_request(payload)
         
@@ -176,7 +231,7 @@ class ClaudeOrchestrationMCP:
                 "total": len(sessions)
             }
         else:
-            raise Exception(result.get("error", "Failed to list sessions"))
+            raise PermanentError(result.get("error", "Failed to list sessions"))
     
     async def wait_for_session(
         self,
@@ -186,11 +241,12 @@ class ClaudeOrchestrationMCP:
     ) -> Dict[str, Any]:
         """Wait for a session to complete with polling"""
         
-        start_time = asyncio.get_event_loop().time()
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
         
         while True:
             # Check if timeout exceeded
-            if asyncio.get_event_loop().time() - start_time > timeout_seconds:
+            if loop.time() - start_time > timeout_seconds:
                 raise TimeoutError(f"Session {session_id} did not complete within {timeout_seconds} seconds")
             
             # Get session status
@@ -203,7 +259,7 @@ class ClaudeOrchestrationMCP:
                     return {
                         "session_id": session_id,
                         "status": status["status"],
-                        "duration_seconds": int(asyncio.get_event_loop().time() - start_time),
+                        "duration_seconds": int(loop.time() - start_time),
                         "output": output.get("output", {})
                     }
                 else:
@@ -211,7 +267,7 @@ class ClaudeOrchestrationMCP:
                         "session_id": session_id,
                         "status": "failed",
                         "error": "Session failed",
-                        "duration_seconds": int(asyncio.get_event_loop().time() - start_time)
+                        "duration_seconds": int(loop.time() - start_time)
                     }
             
             # Wait before next poll
@@ -227,132 +283,133 @@ mcp_server = MCPServer(
     description="Orchestrate multiple Claude Code sessions for complex software projects"
 )
 
-# Register all tools
-mcp_server.register_tool(
-    name="create_session",
-    function=orchestration.create_session,
-    description="Create a new Claude Code session for a specific subtask",
-    parameters={
-        "type": "object",
-        "properties": {
-            "session_type": {
-                "type": "string",
-                "enum": ["implementation", "analysis", "testing", "review", "documentation"],
-                "description": "Type of session based on the task"
-            },
-            "repository": {
-                "type": "string",
-                "description": "Repository in format 'owner/repo'"
-            },
-            "requirements": {
-                "type": "string",
-                "description": "Detailed requirements for this specific session"
-            },
-            "context": {
-                "type": "string",
-                "description": "Additional context about the overall project"
-            },
-            "dependencies": {
-                "type": "array",
-                "items": {"type": "string"},
-                "description": "Session IDs that must complete first"
-            }
+# Tool parameter schemas, built once at import
+CREATE_SESSION_PARAMETERS = {
+    "type": "object",
+    "properties": {
+        "session_type": {
+            "type": "string",
+            "enum": ["implementation", "analysis", "testing", "review", "documentation"],
+            "description": "Type of session based on the task"
         },
-        "required": ["session_type", "repository", "requirements"]
-    }
-)
-
-mcp_server.register_tool(
-    name="start_session",
-    function=orchestration.start_session,
-    description="Start a previously created session or queue it if dependencies aren't met",
-    parameters={
-        "type": "object",
-        "properties": {
-            "session_id": {
-                "type": "string",
-                "description": "The ID of the session to start"
-            }
+        "repository": {
+            "type": "string",
+            "description": "Repository in format 'owner/repo'"
         },
-        "required": ["session_id"]
-    }
-)
-
-mcp_server.register_tool(
-    name="get_session_status",
-    function=orchestration.get_session_status,
-    description="Get the current status and details of a session",
-    parameters={
-        "type": "object",
-        "properties": {
-            "session_id": {
-                "type": "string",
-                "description": "The ID of the session to check"
-            }
+        "requirements": {
+            "type": "string",
+            "description": "Detailed requirements for this specific session"
         },
-        "required": ["session_id"]
-    }
-)
+        "context": {
+            "type": "string",
+            "description": "Additional context about the overall project"
+        },
+        "dependencies": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "Session IDs that must complete first"
+        }
+    },
+    "required": ["session_type", "repository", "requirements"]
+}
 
-mcp_server.register_tool(
-    name="get_session_output",
-    function=orchestration.get_session_output,
-    description="Get the output and results from a completed session",
-    parameters={
+
+def session_id_parameters(description: str) -> Dict[str, Any]:
+    """Schema for tools that take only a session ID"""
+    return {
         "type": "object",
         "properties": {
             "session_id": {
                 "type": "string",
-                "description": "The ID of the completed session"
+                "description": description
             }
         },
         "required": ["session_id"]
     }
-)
 
-mcp_server.register_tool(
-    name="list_sessions",
-    function=orchestration.list_sessions,
-    description="List all sessions, optionally filtered by orchestration ID or status",
-    parameters={
-        "type": "object",
-        "properties": {
-            "orchestration_id": {
-                "type": "string",
-                "description": "Optional orchestration ID to filter sessions"
-            },
-            "status": {
-                "type": "string",
-                "enum": ["pending", "running", "completed", "failed", "all"],
-                "description": "Filter by session status"
-            }
+
+LIST_SESSIONS_PARAMETERS = {
+    "type": "object",
+    "properties": {
+        "orchestration_id": {
+            "type": "string",
+            "description": "Optional orchestration ID to filter sessions"
+        },
+        "status": {
+            "type": "string",
+            "enum": ["pending", "running", "completed", "failed", "all"],
+            "description": "Filter by session status"
         }
     }
-)
+}
 
-mcp_server.register_tool(
-    name="wait_for_session",
-    function=orchestration.wait_for_session,
-    description="Wait for a session to complete with polling",
-    parameters={
-        "type": "object",
-        "properties": {
-            "session_id": {
-                "type": "string",
-                "description": "The ID of the session to wait for"
-            },
-            "timeout_seconds": {
-                "type": "integer",
-                "description": "Maximum seconds to wait (default: 3600)"
-            },
-            "poll_interval_seconds": {
-                "type": "integer",
-                "description": "Seconds between status checks (default: 10)"
-            }
+WAIT_FOR_SESSION_PARAMETERS = {
+    "type": "object",
+    "properties": {
+        "session_id": {
+            "type": "string",
+            "description": "The ID of the session to wait for"
         },
-        "required": ["session_id"]
-    }
-)
+        "timeout_seconds": {
+            "type": "integer",
+            "description": "Maximum seconds to wait (default: 3600)"
+        },
+        "poll_interval_seconds": {
+            "type": "integer",
+            "description": "Seconds between status checks (default: 10)"
+        }
+    },
+    "required": ["session_id"]
+}
+
+# (name, function, description, parameters) for every tool
+TOOLS = [
+    (
+        "create_session",
+        orchestration.create_session,
+        "Create a new Claude Code session for a specific subtask",
+        CREATE_SESSION_PARAMETERS
+    ),
+    (
+        "start_session",
+        orchestration.start_session,
+        "Start a previously created session or queue it if dependencies aren't met",
+        session_id_parameters("The ID of the session to start")
+    ),
+    (
+        "get_session_status",
+        orchestration.get_session_status,
+        "Get the current status and details of a session",
+        session_id_parameters("The ID of the session to check")
+    ),
+    (
+        "get_session_output",
+        orchestration.get_session_output,
+        "Get the output and results from a completed session",
+        session_id_parameters("The ID of the completed session")
+    ),
+    (
+        "list_sessions",
+        orchestration.list_sessions,
+        "List all sessions, optionally filtered by orchestration ID or status",
+        LIST_SESSIONS_PARAMETERS
+    ),
+    (
+        "wait_for_session",
+        orchestration.wait_for_session,
+        "Wait for a session to complete with polling",
+        WAIT_FOR_SESSION_PARAMETERS
+    ),
+]
+
+# Register all tools
+for name, function, description, parameters in TOOLS:
+    mcp_server.register_tool(
+        name=name,
+        function=function,
+        description=description,
+        parameters=parameters
+    )
 
 # Example Gradio interface (optional - for testing)
 if __name__ == "__main__":
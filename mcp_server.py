@@ -7,20 +7,303 @@ to work on complex projects in parallel.
 
 import os
 import asyncio
-from typing import Dict, List, Optional, Any
+import contextlib
+import random
+import re
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from functools import lru_cache
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Any
+from urllib.parse import quote
 import httpx
 from dotenv import load_dotenv
 import json
 import gradio as gr
-import concurrent.futures
-import nest_asyncio
 
-# Apply nest_asyncio to allow nested event loops
-nest_asyncio.apply()
+# Use orjson for request/response bodies and displayed results when it is installed
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+    
+    def _format(obj: Any) -> str:
+        """Format a result for display, indented unless PRETTY_RESULTS is off"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if PRETTY_RESULTS else 0).decode()
+except ImportError:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+    _loads = json.loads
+    
+    def _format(obj: Any) -> str:
+        """Format a result for display, indented unless PRETTY_RESULTS is off"""
+        if PRETTY_RESULTS:
+            return json.dumps(obj, indent=2)
+        return json.dumps(obj, separators=(",", ":"))
+
+# HTTP/2 support in httpx needs the optional h2 package
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# The background loop that runs API calls uses uvloop when it is installed
+try:
+    import uvloop
+    _new_event_loop = uvloop.new_event_loop
+except ImportError:
+    _new_event_loop = asyncio.new_event_loop
 
 # Load environment variables
 load_dotenv()
 
+# Skip Gradio's telemetry calls at startup and launch unless explicitly enabled
+os.environ.setdefault("GRADIO_ANALYTICS_ENABLED", "False")
+
+# Indent tool results; turning this off returns compact JSON, which is smaller
+# to send and cheaper to produce for large session lists
+PRETTY_RESULTS = os.getenv("MCP_PRETTY_JSON", "1").lower() not in ("0", "false", "no")
+
+# Extra time allowed on top of a long-poll wait before the request times out
+LONG_POLL_GRACE_SECONDS = 10
+# A session event stream with no status event for this long (seconds) is
+# abandoned in favour of polling
+EVENTS_IDLE_TIMEOUT = 60.0
+
+# Pre-serialized request bodies for events that carry only a session ID; the
+# JSON-encoded ID is spliced in with %
+_SESSION_EVENT_TEMPLATES = {
+    event: b'{"type":"' + event.encode() + b'","sessionId":%b}'
+    for event in ("session.start", "session.get", "session.output")
+}
+# Cache keys are request bodies, which start with the event type
+_OUTPUT_BODY_PREFIX = b'{"type":"session.output"'
+_LIST_BODY_PREFIX = b'{"type":"session.list"'
+
+
+@lru_cache(maxsize=256)
+def _session_event_body(event: str, session_id: str) -> bytes:
+    """Build the request body for a single-session event
+    
+    Memoized, since a wait polls with the same body over and over.
+    """
+    return _SESSION_EVENT_TEMPLATES[event] % _dumps(session_id)
+
+
+def _is_transient(e: httpx.HTTPError) -> bool:
+    """Whether a failed request may succeed if sent again later"""
+    if isinstance(e, httpx.HTTPStatusError):
+        return e.response.status_code == 429 or e.response.status_code >= 500
+    return isinstance(e, httpx.TransportError)
+
+
+def _envelope(
+    event: str,
+    result: Dict[str, Any],
+    message: str = "Webhook processed",
+    handler_count: int = 1
+) -> Dict[str, Any]:
+    """Wrap a single result in the webhook handler response format"""
+    return {"message": message, "event": event, "handlerCount": handler_count, "results": [result]}
+
+
+def _failure(event: str, error: str) -> Dict[str, Any]:
+    """Response for a request that failed before a handler produced a result"""
+    return _envelope(event, {"success": False, "error": error}, "Webhook processing failed", 0)
+
+
+def _first_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the first result of a webhook response, or an empty dict"""
+    try:
+        first_result = result["results"][0]
+    except (KeyError, IndexError, TypeError):
+        return {}
+    return first_result if isinstance(first_result, dict) else {}
+
+
+def _success_data(result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Return the data of a successful webhook response, or None"""
+    first_result = _first_result(result)
+    return first_result.get("data", {}) if first_result.get("success") else None
+
+
+def _unwrap(
+    result: Dict[str, Any],
+    event: str,
+    transform: Callable[[Dict[str, Any]], Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Rewrap a webhook response, passing the data of a successful one through transform
+    
+    Error responses are returned as-is; a response without results is
+    reported as an unexpected format. When transform hands back the data
+    unchanged and the response is already in canonical form, the response
+    itself is returned rather than a copy.
+    """
+    if not result.get("results"):
+        return _envelope(event, {
+            "success": False,
+            "error": "Unexpected response format from API"
+        })
+    first_result = result["results"][0]
+    if not first_result.get("success"):
+        return result
+    data = first_result.get("data", {})
+    transformed = transform(data)
+    if transformed is data and first_result.keys() <= {"success", "data"} and result == _envelope(event, first_result):
+        return result
+    return _envelope(event, {
+        "success": True,
+        "data": transformed
+    })
+
+
+def _project_session(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Pick the session fields returned by get_session_status"""
+    # v2.0.0: data is wrapped in data.session
+    session = data.get("session", data)
+    return {
+        "session": {
+            "id": session.get("id"),
+            "type": session.get("type"),
+            "status": session.get("status"),
+            "containerId": session.get("containerId"),
+            "claudeSessionId": session.get("claudeSessionId"),
+            "project": session.get("project", {}),
+            "dependencies": session.get("dependencies", []),
+            "startedAt": session.get("startedAt"),
+            "completedAt": session.get("completedAt"),
+            "output": session.get("output"),
+            "error": session.get("error")
+        }
+    }
+
+
+def _normalize_output(output: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill in the fields of a session output the tools always return"""
+    return {
+        "logs": output.get("logs", []),
+        "artifacts": output.get("artifacts", []),
+        "summary": output.get("summary", ""),
+        "nextSteps": output.get("nextSteps", [])
+    }
+
+# wait_for_session starts polling at this interval (seconds) and backs off by
+# POLL_BACKOFF_FACTOR per unchanged poll, up to poll_interval_seconds
+POLL_INITIAL_INTERVAL = 0.25
+POLL_BACKOFF_FACTOR = 1.7
+# Random +/- fraction applied to each poll delay so waiters don't sync up
+POLL_JITTER = 0.2
+
+# How long successful read responses are reused, in seconds
+STATUS_CACHE_TTL = 0.5
+OUTPUT_CACHE_TTL = 5.0
+LIST_CACHE_TTL = 0.5
+TERMINAL_STATUSES = ("completed", "failed")
+# A completed session's output no longer changes, so it is kept longer. Status
+# responses keep STATUS_CACHE_TTL even when terminal, since the session may be
+# restarted from elsewhere (the hub or another MCP instance).
+COMPLETED_OUTPUT_CACHE_TTL = 300.0
+# Maximum number of cached read responses
+RESPONSE_CACHE_SIZE = 256
+
+# Read-only events are resent after transient failures; other events only
+# when the connection could not be made, so the server never saw them
+IDEMPOTENT_EVENTS = frozenset({"session.get", "session.get_batch", "session.output", "session.list"})
+RETRY_ATTEMPTS = 4
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 30.0
+RETRY_JITTER = 0.3
+
+SESSION_STATUSES = ("pending", "initializing", "queued", "running", "completed", "failed", "cancelled")
+VALID_SESSION_TYPES = frozenset({"implementation", "analysis", "testing", "review", "coordination"})
+_REPOSITORY_RE = re.compile(r"\A[^/]+/[^/]+\Z")
+
+
+def _retry_delay(e: httpx.HTTPError, attempt: int, idempotent: bool) -> Optional[float]:
+    """Seconds to wait before resending a failed request, or None to give up"""
+    if not isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout)):
+        if not idempotent or not _is_transient(e):
+            return None
+    delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt) + random.uniform(0, RETRY_JITTER)
+    if isinstance(e, httpx.HTTPStatusError):
+        retry_after = e.response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            delay = max(delay, min(RETRY_MAX_DELAY, float(retry_after)))
+    return delay
+
+
+def _build_session(
+    session_type: str,
+    repository: str,
+    requirements: str,
+    context: Optional[str] = None,
+    branch: Optional[str] = None,
+    dependencies: Optional[List[str]] = None,
+    auto_start: bool = True,
+    timeout_minutes: Optional[int] = None
+) -> Dict[str, Any]:
+    """Validate create_session arguments and build the session part of the request
+    
+    Raises:
+        ValueError: with the message to report when an argument is invalid
+    """
+    
+    # Validate session type
+    if session_type not in VALID_SESSION_TYPES:
+        raise ValueError(f"Invalid session type: {session_type}. Must be one of: {', '.join(sorted(VALID_SESSION_TYPES))}")
+    
+    # Validate repository is "owner/repo" with exactly one slash and non-empty halves
+    if not repository or not _REPOSITORY_RE.match(repository):
+        raise ValueError("Invalid repository format. Must be in 'owner/repo' format with non-empty owner and repo names")
+    
+    # Validate requirements is not empty
+    if not requirements or not requirements.strip():
+        raise ValueError("Requirements cannot be empty")
+    
+    # Build project data
+    project_data = {
+        "repository": repository,
+        "requirements": requirements
+    }
+    
+    if context:
+        project_data["context"] = context
+    
+    if branch:
+        project_data["branch"] = branch
+    
+    # Skip empty strings and 'None' placeholders
+    valid_deps = [dep for dep in dependencies if dep and dep.lower() != "none"] if dependencies else []
+    
+    # Build session options
+    options = {
+        "autoStart": auto_start
+    }
+    
+    if timeout_minutes:
+        options["timeout"] = timeout_minutes * 60  # Convert to seconds
+    
+    return {
+        "type": session_type,
+        "project": project_data,
+        "dependencies": valid_deps,
+        "options": options
+    }
+
+
+def _created_session(session_data: Dict[str, Any], session: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Summarize a session the API reports as created, or None if it has no ID"""
+    session_id = session_data.get("id") or session_data.get("sessionId")
+    if not session_id:
+        return None
+    return {
+        "id": session_id,
+        "status": session_data.get("status", "pending"),
+        "type": session["type"],
+        "autoStart": session["options"]["autoStart"]
+    }
 
 class ClaudeOrchestrationMCP:
     """MCP Server for orchestrating Claude Code sessions"""
@@ -28,69 +311,267 @@ class ClaudeOrchestrationMCP:
     def __init__(self):
         self.api_url = os.getenv("CLAUDE_HUB_API_URL", "http://localhost:3002/api/webhooks/claude")
         self.auth_token = os.getenv("CLAUDE_WEBHOOK_SECRET", "")
+        # Parsed once so each request skips URL parsing
+        self._url = httpx.URL(self.api_url)
+        self._base_headers = {
+            "Authorization": f"Bearer {self.auth_token}",
+            "Content-Type": "application/json"
+        }
         self.client = None
+        # Loop that self.client belongs to; other loops get their own client
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+        # Cap on concurrent API requests; extra callers queue here instead of
+        # contending for connections inside the httpx pool
+        self.max_inflight = int(os.getenv("CLAUDE_HUB_MAX_INFLIGHT", "64"))
+        # One semaphore per event loop, since asyncio primitives are loop-bound
+        self._request_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+        # Recent successful read responses: request body -> (expires_at, result)
+        self._cache: "OrderedDict[bytes, tuple]" = OrderedDict()
+        # Read requests in flight, shared by identical concurrent callers
+        self._inflight: Dict[bytes, asyncio.Task] = {}
+        # Last ETag and response per conditional request key
+        self._etags: "OrderedDict[str, tuple]" = OrderedDict()
+        # Waits in progress, shared by concurrent callers for the same session
+        self._waits: Dict[str, Dict[str, Any]] = {}
+        # Whether the API answers session.get_batch; None until we know
+        self._batch_supported: Optional[bool] = None
+        # Whether the API answers session.create_batch; None until we know
+        self._create_batch_supported: Optional[bool] = None
+        # Whether the API serves session event streams; None until we know
+        self._events_supported: Optional[bool] = None
+        # Server-sent status events are only followed when the API publishes
+        # them; the webhook API itself defines no such endpoint
+        self.events_url = os.getenv("CLAUDE_HUB_EVENTS_URL", "")
         
-    async def _ensure_client(self):
-        """Ensure httpx client is created"""
-        if self.client is None:
-            self.client = httpx.AsyncClient(timeout=30.0)
+    def _new_client(self) -> httpx.AsyncClient:
+        """Create an httpx client that keeps connections to the API alive
+        between calls and sends the auth headers by default"""
+        return httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            # Allow longer for a free pooled connection than for the request itself
+            timeout=httpx.Timeout(30.0, connect=5.0, pool=60.0),
+            limits=httpx.Limits(
+                max_connections=256,
+                max_keepalive_connections=64,
+                keepalive_expiry=60.0
+            ),
+            headers=self._base_headers
+        )
     
-    async def _make_request(self, payload: Dict[str, Any]) -> Dict[str, Any]:
-        """Make authenticated request to Claude Hub API"""
-        await self._ensure_client()
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the httpx client for the running event loop
         
-        headers = {
-            "Authorization": f"Bearer {self.auth_token}",
-            "Content-Type": "application/json"
-        }
+        Pooled connections belong to the loop that opened them. self.client
+        serves the loop that first used it (normally the shared background
+        loop); any other loop gets a client of its own, dropped with the loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self.client is None or (self._client_loop is not None and self._client_loop.is_closed()):
+            self.client = self._new_client()
+            self._client_loop = loop
+        elif self._client_loop is None:
+            self._client_loop = loop
+        
+        if self._client_loop is loop:
+            return self.client
+        client = self._loop_clients.get(loop)
+        if client is None:
+            client = self._loop_clients[loop] = self._new_client()
+        return client
+    
+    async def _make_request(
+        self,
+        payload: Dict[str, Any],
+        timeout: Optional[float] = None,
+        cache_ttl: Optional[float] = None,
+        etag_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Make authenticated request to Claude Hub API
+        
+        Args:
+            payload: Webhook event payload; its "type" names the event
+            timeout: Per-request timeout in seconds, overriding the client default;
+                retries of the request must also finish within it. Such a request
+                is taken to be a long poll and does not count toward max_inflight
+            cache_ttl: For read-only events, share the response between identical
+                concurrent requests and reuse a successful one for this many seconds.
+                Cached responses are shared and must not be mutated.
+            etag_key: For read-only events, remember the response ETag under this
+                key and send it back as If-None-Match; a 304 reply returns the
+                previous response without a body being transferred
+        """
+        return await self._request(payload["type"], _dumps(payload), timeout, cache_ttl, etag_key)
+    
+    async def _request(
+        self,
+        event: str,
+        body: bytes,
+        timeout: Optional[float] = None,
+        cache_ttl: Optional[float] = None,
+        etag_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Make authenticated request with an already serialized body
+        
+        See _make_request for the meaning of timeout, cache_ttl and etag_key.
+        """
+        if cache_ttl:
+            return await self._coalesce(body, cache_ttl, lambda: self._send(event, body, timeout, etag_key))
+        
+        return await self._send(event, body, timeout, etag_key)
+    
+    async def _coalesce(
+        self,
+        key: bytes,
+        ttl: float,
+        fetch: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Return a fresh cached response for key, or join/start the request for it"""
+        cached = self._cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            self._cache.move_to_end(key)
+            return cached[1]
+        
+        loop = asyncio.get_running_loop()
+        task = self._inflight.get(key)
+        # Tasks can only be awaited from the loop that runs them
+        if task is None or task.get_loop() is not loop:
+            task = loop.create_task(fetch())
+            self._inflight[key] = task
+            
+            def _done(finished: asyncio.Task) -> None:
+                # A request dropped by _invalidate_cache may predate the change
+                # that invalidated it, so its response is not cached
+                if self._inflight.get(key) is not finished:
+                    return
+                del self._inflight[key]
+                if finished.cancelled() or finished.exception() is not None:
+                    return
+                self._store(key, ttl, finished.result())
+            
+            task.add_done_callback(_done)
+        
+        # Shield so one caller giving up doesn't cancel the request for the others
+        return await asyncio.shield(task)
+    
+    def _store(self, key: bytes, ttl: float, result: Dict[str, Any]) -> None:
+        """Cache a response for key if it was successful"""
+        data = _success_data(result)
+        if data is not None:
+            if key.startswith(_OUTPUT_BODY_PREFIX):
+                # v2.0.0: data is wrapped in data.session
+                session = data.get("session", data)
+                if isinstance(session, dict) and session.get("status") == "completed":
+                    ttl = max(ttl, COMPLETED_OUTPUT_CACHE_TTL)
+            self._cache[key] = (time.monotonic() + ttl, result)
+            self._cache.move_to_end(key)
+            while len(self._cache) > RESPONSE_CACHE_SIZE:
+                self._cache.popitem(last=False)
+    
+    def _invalidate_cache(self, session_id: Optional[str] = None):
+        """Drop cached read responses after a request that changes session state
+        
+        With a session_id, only that session's responses and session lists
+        are dropped.
+        """
+        if session_id is None:
+            self._cache.clear()
+            self._inflight.clear()
+            return
+        stale = [_session_event_body(event, session_id) for event in ("session.get", "session.output")]
+        stale += [key for key in (*self._cache, *self._inflight) if key.startswith(_LIST_BODY_PREFIX)]
+        for key in stale:
+            self._cache.pop(key, None)
+            self._inflight.pop(key, None)
+    
+    def _get_request_slots(self) -> asyncio.Semaphore:
+        """Get the request-limiting semaphore for the running event loop"""
+        loop = asyncio.get_running_loop()
+        slots = self._request_slots.get(loop)
+        if slots is None:
+            slots = self._request_slots[loop] = asyncio.Semaphore(self.max_inflight)
+        return slots
+    
+    async def _send(
+        self,
+        event: str,
+        body: bytes,
+        timeout: Optional[float],
+        etag_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """POST a serialized payload and normalize the response to webhook format"""
+        client = self._get_client()
+        
+        known = self._etags.get(etag_key) if etag_key else None
+        idempotent = event in IDEMPOTENT_EVENTS
+        clock = asyncio.get_running_loop().time
+        # A request with its own timeout (a long poll) keeps all its attempts
+        # within that time, so a wait is never extended by retries
+        give_up_at = clock() + timeout if timeout is not None else None
+        # A long poll is held open until the session changes, so like the
+        # event stream it does not take a request slot; otherwise a few waits
+        # would queue every other call behind them
+        slots = self._get_request_slots() if timeout is None else contextlib.nullcontext()
         
         try:
-            response = await self.client.post(
-                self.api_url,
-                json=payload,
-                headers=headers
-            )
-            response.raise_for_status()
-            data = response.json()
+            for attempt in range(RETRY_ATTEMPTS):
+                try:
+                    async with slots:
+                        response = await client.post(
+                            self._url,
+                            content=body,
+                            headers={"If-None-Match": known[0]} if known else None,
+                            timeout=give_up_at - clock() if give_up_at is not None else httpx.USE_CLIENT_DEFAULT
+                        )
+                    
+                    # Unchanged since the last response we saw
+                    if known and response.status_code == 304:
+                        self._etags.move_to_end(etag_key)
+                        return known[1]
+                    
+                    response.raise_for_status()
+                    break
+                except httpx.HTTPError as e:
+                    delay = _retry_delay(e, attempt, idempotent)
+                    if delay is None or attempt == RETRY_ATTEMPTS - 1:
+                        raise
+                    if give_up_at is not None and clock() + delay >= give_up_at:
+                        raise
+                    await asyncio.sleep(delay)
+            
+            data = _loads(response.content)
             
             # Validate response is a dictionary
             if not isinstance(data, dict):
-                return {
-                    "message": "Webhook processing failed",
-                    "event": payload.get("type", "unknown"),
-                    "handlerCount": 0,
-                    "results": [{
-                        "success": False,
-                        "error": f"Invalid response format: expected dictionary, got {type(data).__name__}"
-                    }]
-                }
+                return _failure(event, f"Invalid response format: expected dictionary, got {type(data).__name__}")
             
             # If the response has a standard API format, convert to webhook format
             if "success" in data and "results" not in data:
-                return {
-                    "message": "Webhook processed" if data.get("success") else "Webhook processing failed",
-                    "event": payload.get("type", "unknown"),
-                    "handlerCount": 1 if data.get("success") else 0,
-                    "results": [{
-                        "success": bool(data.get("success")),
-                        "message": data.get("message", ""),
-                        "data": data.get("data", {}),
-                        "error": data.get("error")
-                    }]
-                }
-            else:
-                return data
+                success = bool(data.get("success"))
+                data = _envelope(event, {
+                    "success": success,
+                    "message": data.get("message", ""),
+                    "data": data.get("data", {}),
+                    "error": data.get("error")
+                }, *(("Webhook processed", 1) if success else ("Webhook processing failed", 0)))
+            
+            etag = response.headers.get("ETag")
+            if etag_key and etag:
+                self._etags[etag_key] = (etag, data)
+                self._etags.move_to_end(etag_key)
+                while len(self._etags) > RESPONSE_CACHE_SIZE:
+                    self._etags.popitem(last=False)
+            
+            return data
         except httpx.HTTPError as e:
             # Return in webhook handler format
-            return {
-                "message": "Webhook processing failed",
-                "event": payload.get("type", "unknown"),
-                "handlerCount": 0,
-                "results": [{
-                    "success": False,
-                    "error": f"API request failed: {str(e)}"
-                }]
+            result = {
+                "success": False,
+                "error": f"API request failed: {str(e)}"
             }
+            if _is_transient(e):
+                result["retryable"] = True
+            return _envelope(event, result, "Webhook processing failed", 0)
     
     async def create_session(
         self,
@@ -116,176 +597,141 @@ class ClaudeOrchestrationMCP:
             timeout_minutes: Maximum runtime in minutes before session is terminated
         """
         
-        # Validate session type
-        valid_session_types = {"implementation", "analysis", "testing", "review", "coordination"}
-        if session_type not in valid_session_types:
-            return {
-                "message": "Webhook processing failed",
-                "event": "session.create",
-                "handlerCount": 0,
-                "results": [{
-                    "success": False,
-                    "error": f"Invalid session type: {session_type}. Must be one of: {', '.join(sorted(valid_session_types))}"
-                }]
-            }
+        try:
+            session = _build_session(
+                session_type, repository, requirements, context, branch,
+                dependencies, auto_start, timeout_minutes
+            )
+        except ValueError as e:
+            return _failure("session.create", str(e))
         
-        # Validate repository format
-        if not repository or "/" not in repository:
-            return {
-                "message": "Webhook processing failed",
-                "event": "session.create",
-                "handlerCount": 0,
-                "results": [{
-                    "success": False,
-                    "error": "Invalid repository format. Must be in 'owner/repo' format"
-                }]
-            }
+        result = await self._make_request({"type": "session.create", "session": session})
+        self._invalidate_cache()
         
-        # Validate repository has exactly one slash
-        parts = repository.split("/")
-        if len(parts) != 2 or not parts[0] or not parts[1]:
-            return {
-                "message": "Webhook processing failed",
-                "event": "session.create",
-                "handlerCount": 0,
-                "results": [{
-                    "success": False,
-                    "error": "Invalid repository format. Must be in 'owner/repo' format with non-empty owner and repo names"
-                }]
-            }
+        # Extract data from webhook response (v2.0.0 format)
+        data = _success_data(result)
+        if data is None:
+            return result  # Return as-is if error or unexpected format
         
-        # Validate requirements is not empty
-        if not requirements or not requirements.strip():
-            return {
-                "message": "Webhook processing failed",
-                "event": "session.create",
-                "handlerCount": 0,
-                "results": [{
-                    "success": False,
-                    "error": "Requirements cannot be empty"
-                }]
+        # v2.0.0: data is wrapped in data.session
+        created = _created_session(data.get("session", data), session)
+        if created is None:
+            # Session ID not found in expected locations
+            return _failure("session.create", "Session ID not found in API response")
+        
+        return _envelope("session.create", {
+            "success": True,
+            "message": "Session created",
+            "data": {
+                "session": created
             }
+        })
+    
+    async def create_sessions(self, specs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Create several sessions at once
         
-        # Build project data
-        project_data = {
-            "repository": repository,
-            "requirements": requirements
-        }
+        Each spec holds create_session keyword arguments. Valid specs are sent
+        in a single session.create_batch request when the API supports it;
+        otherwise they are created concurrently (bounded by max_inflight).
+        The results are merged into one response in spec order, and a spec
+        that failed is reported with its error instead of failing the whole
+        batch.
+        """
         
-        if context:
-            project_data["context"] = context
+        # A validated session, or the error for a spec that failed validation
+        built: List[Any] = []
+        for spec in specs:
+            try:
+                built.append(_build_session(**spec))
+            except (TypeError, ValueError) as e:
+                built.append(str(e))
+        valid = [session for session in built if isinstance(session, dict)]
         
-        if branch:
-            project_data["branch"] = branch
+        if len(valid) > 1 and self._create_batch_supported is not False:
+            result = await self._make_request({"type": "session.create_batch", "sessions": valid})
+            self._invalidate_cache()
+            data = _success_data(result)
+            if data is not None and isinstance(data.get("sessions"), list):
+                self._create_batch_supported = True
+                created = iter(data["sessions"])
+                sessions = []
+                for session in built:
+                    if isinstance(session, str):
+                        sessions.append({"error": session})
+                        continue
+                    summary = _created_session(next(created, {}), session)
+                    sessions.append(summary or {"error": "Session ID not found in API response"})
+                return _envelope("create_sessions", {
+                    "success": True,
+                    "data": {
+                        "sessions": sessions
+                    }
+                })
+            if _first_result(result).get("retryable"):
+                # The batch may have been created; resending it one by one
+                # could duplicate sessions
+                return result
+            self._create_batch_supported = False
         
-        # Filter out invalid dependencies
-        valid_deps = []
-        if dependencies:
-            for dep in dependencies:
-                # Skip empty strings and 'None' string
-                if dep and dep.lower() != 'none':
-                    valid_deps.append(dep)
+        async def create(spec: Dict[str, Any], session: Any) -> Dict[str, Any]:
+            if isinstance(session, str):
+                return _failure("session.create", session)
+            return await self.create_session(**spec)
         
-        # Build session options
-        options = {
-            "autoStart": auto_start
-        }
+        responses = await asyncio.gather(
+            *(create(spec, session) for spec, session in zip(specs, built)),
+            return_exceptions=True
+        )
         
-        if timeout_minutes:
-            options["timeout"] = timeout_minutes * 60  # Convert to seconds
+        sessions = []
+        for response in responses:
+            if isinstance(response, Exception):
+                sessions.append({"error": str(response)})
+                continue
+            first_result = _first_result(response)
+            if first_result.get("success"):
+                sessions.append(first_result.get("data", {}).get("session", {}))
+            else:
+                sessions.append({"error": first_result.get("error", "Failed to create session")})
         
-        payload = {
-            "type": "session.create",
-            "session": {
-                "type": session_type,
-                "project": project_data,
-                "dependencies": valid_deps,
-                "options": options
+        return _envelope("create_sessions", {
+            "success": True,
+            "data": {
+                "sessions": sessions
             }
-        }
-        
-        result = await self._make_request(payload)
-        
-        # Extract data from webhook response (v2.0.0 format)
-        if "results" in result and isinstance(result.get("results"), list) and len(result.get("results", [])) > 0:
-            first_result = result["results"][0]
-            if isinstance(first_result, dict) and first_result.get("success"):
-                data = first_result.get("data", {})
-                # v2.0.0: data is wrapped in data.session
-                session_data = data.get("session", data)
-                session_id = session_data.get("id") or session_data.get("sessionId")
-                
-                if session_id:
-                    return {
-                        "message": "Webhook processed",
-                        "event": "session.create",
-                        "handlerCount": 1,
-                        "results": [{
-                            "success": True,
-                            "message": "Session created",
-                            "data": {
-                                "session": {
-                                    "id": session_id,
-                                    "status": session_data.get("status", "pending"),
-                                    "type": session_type,
-                                    "autoStart": auto_start
-                                }
-                            }
-                        }]
-                    }
-                else:
-                    # Session ID not found in expected locations
-                    return {
-                        "message": "Webhook processing failed",
-                        "event": "session.create",
-                        "handlerCount": 0,
-                        "results": [{
-                            "success": False,
-                            "error": "Session ID not found in API response"
-                        }]
-                    }
-        
-        return result  # Return as-is if error or unexpected format
+        })
     
     async def start_session(self, session_id: str) -> Dict[str, Any]:
         """Start a previously created session"""
         
-        payload = {
-            "type": "session.start",
-            "sessionId": session_id
-        }
-        
-        result = await self._make_request(payload)
+        result = await self._request("session.start", _session_event_body("session.start", session_id))
+        self._invalidate_cache(session_id)
         
         # Extract data from webhook response
-        if "results" in result and len(result.get("results", [])) > 0:
-            first_result = result["results"][0]
-            if first_result.get("success"):
-                data = first_result.get("data", {})
-                # v2.0.0: data is wrapped in data.session
-                session_data = data.get("session", data)
-                status = session_data.get("status", "initializing")
-                
-                return {
-                    "message": "Webhook processed",
-                    "event": "session.start",
-                    "handlerCount": 1,
-                    "results": [{
-                        "success": True,
-                        "message": "Session starting" if status == "initializing" else f"Session {status}",
-                        "data": {
-                            "session": {
-                                "status": status
-                            }
-                        }
-                    }]
-                }
+        data = _success_data(result)
+        if data is None:
+            return result  # Return as-is if error or unexpected format
         
-        return result  # Return as-is if error or unexpected format
+        # v2.0.0: data is wrapped in data.session
+        status = data.get("session", data).get("status", "initializing")
+        return _envelope("session.start", {
+            "success": True,
+            "message": "Session starting" if status == "initializing" else f"Session {status}",
+            "data": {
+                "session": {
+                    "status": status
+                }
+            }
+        })
     
-    async def get_session_status(self, session_id: str) -> Dict[str, Any]:
+    async def get_session_status(self, session_id: str, wait_seconds: Optional[float] = None) -> Dict[str, Any]:
         """Get the current status and details of a session
         
+        Args:
+            session_id: ID of the session
+            wait_seconds: Ask the server to hold the response for up to this many
+                seconds until the session status changes (long polling)
+        
         Returns session info including:
             status: pending, initializing, running, completed, failed, cancelled, or queued
             containerId: Docker container ID if running
@@ -295,56 +741,84 @@ class ClaudeOrchestrationMCP:
             error: Error message if failed
         """
         
-        payload = {
-            "type": "session.get",
-            "sessionId": session_id
-        }
+        if wait_seconds:
+            payload = {
+                "type": "session.get",
+                "sessionId": session_id,
+                "waitMs": int(wait_seconds * 1000),
+                # Let the server send the output along with a final status
+                "includeOutputOnTerminal": True
+            }
+            result = await self._make_request(
+                payload,
+                timeout=wait_seconds + LONG_POLL_GRACE_SECONDS,
+                etag_key=session_id
+            )
+            # The answer is as fresh as a plain status read, so share it with those
+            self._store(_session_event_body("session.get", session_id), STATUS_CACHE_TTL, result)
+        else:
+            result = await self._request(
+                "session.get",
+                _session_event_body("session.get", session_id),
+                cache_ttl=STATUS_CACHE_TTL,
+                etag_key=session_id
+            )
+        
+        return _unwrap(result, "session.get", _project_session)
+    
+    async def get_sessions_status(self, session_ids: List[str]) -> Dict[str, Any]:
+        """Get the status of several sessions at once
+        
+        Uses a single session.get_batch request when the API supports it.
+        Otherwise the status requests are issued concurrently (bounded by
+        max_inflight) and merged into one response; a session whose lookup
+        failed is reported with its error instead of failing the whole batch.
+        """
         
-        result = await self._make_request(payload)
+        if len(session_ids) > 1 and self._batch_supported is not False:
+            result = await self._make_request(
+                {"type": "session.get_batch", "sessionIds": session_ids},
+                cache_ttl=STATUS_CACHE_TTL
+            )
+            data = _success_data(result)
+            if data is not None and isinstance(data.get("sessions"), list):
+                self._batch_supported = True
+                found = {session.get("id"): session for session in data["sessions"]}
+                return _envelope("get_sessions_status", {
+                    "success": True,
+                    "data": {
+                        "sessions": [
+                            _project_session(found[session_id])["session"] if session_id in found
+                            else {"id": session_id, "error": "Session not found"}
+                            for session_id in session_ids
+                        ]
+                    }
+                })
+            if not _first_result(result).get("retryable"):
+                self._batch_supported = False
         
-        # Check if response is in webhook handler format
-        if "results" in result and len(result.get("results", [])) > 0:
-            first_result = result["results"][0]
+        responses = await asyncio.gather(
+            *(self.get_session_status(session_id) for session_id in session_ids),
+            return_exceptions=True
+        )
+        
+        sessions = []
+        for session_id, response in zip(session_ids, responses):
+            if isinstance(response, Exception):
+                sessions.append({"id": session_id, "error": str(response)})
+                continue
+            first_result = _first_result(response)
             if first_result.get("success"):
-                data = first_result.get("data", {})
-                # v2.0.0: data is wrapped in data.session
-                session = data.get("session", data)
-                return {
-                    "message": "Webhook processed",
-                    "event": "session.get",
-                    "handlerCount": 1,
-                    "results": [{
-                        "success": True,
-                        "data": {
-                            "session": {
-                                "id": session.get("id"),
-                                "type": session.get("type"),
-                                "status": session.get("status"),
-                                "containerId": session.get("containerId"),
-                                "claudeSessionId": session.get("claudeSessionId"),
-                                "project": session.get("project", {}),
-                                "dependencies": session.get("dependencies", []),
-                                "startedAt": session.get("startedAt"),
-                                "completedAt": session.get("completedAt"),
-                                "output": session.get("output"),
-                                "error": session.get("error")
-                            }
-                        }
-                    }]
-                }
+                sessions.append(first_result.get("data", {}).get("session", {}))
             else:
-                return result  # Return error response as-is
-        else:
-            # Fallback for unexpected response format
-            return {
-                "message": "Webhook processed",
-                "event": "session.get",
-                "handlerCount": 1,
-                "results": [{
-                    "success": False,
-                    "error": "Unexpected response format from API"
-                }]
+                sessions.append({"id": session_id, "error": first_result.get("error", "Failed to get session status")})
+        
+        return _envelope("get_sessions_status", {
+            "success": True,
+            "data": {
+                "sessions": sessions
             }
+        })
     
     async def get_session_output(self, session_id: str) -> Dict[str, Any]:
         """Get the output and artifacts from a completed session
@@ -356,52 +830,22 @@ class ClaudeOrchestrationMCP:
             nextSteps: Suggested next steps
         """
         
-        payload = {
-            "type": "session.output",
-            "sessionId": session_id
-        }
+        result = await self._request(
+            "session.output",
+            _session_event_body("session.output", session_id),
+            cache_ttl=OUTPUT_CACHE_TTL
+        )
         
-        result = await self._make_request(payload)
-        
-        # Check if response is in webhook handler format
-        if "results" in result and len(result.get("results", [])) > 0:
-            first_result = result["results"][0]
-            if first_result.get("success"):
-                data = first_result.get("data", {})
-                # v2.0.0: data may be wrapped
-                session_data = data.get("session", data)
-                output = session_data.get("output", {})
-                return {
-                    "message": "Webhook processed",
-                    "event": "session.output",
-                    "handlerCount": 1,
-                    "results": [{
-                        "success": True,
-                        "data": {
-                            "sessionId": session_data.get("id", session_id),
-                            "status": session_data.get("status", "completed"),
-                            "output": {
-                                "logs": output.get("logs", []),
-                                "artifacts": output.get("artifacts", []),
-                                "summary": output.get("summary", ""),
-                                "nextSteps": output.get("nextSteps", [])
-                            }
-                        }
-                    }]
-                }
-            else:
-                return result  # Return error response as-is
-        else:
-            # Fallback for unexpected response format
+        def transform(data: Dict[str, Any]) -> Dict[str, Any]:
+            # v2.0.0: data may be wrapped
+            session_data = data.get("session", data)
             return {
-                "message": "Webhook processed",
-                "event": "session.output",
-                "handlerCount": 1,
-                "results": [{
-                    "success": False,
-                    "error": "Unexpected response format from API"
-                }]
+                "sessionId": session_data.get("id", session_id),
+                "status": session_data.get("status", "completed"),
+                "output": _normalize_output(session_data.get("output", {}))
             }
+        
+        return _unwrap(result, "session.output", transform)
     
     async def list_sessions(
         self, 
@@ -418,146 +862,456 @@ class ClaudeOrchestrationMCP:
         }
         
         if status and status != "all":
+            if status not in SESSION_STATUSES:
+                return _failure("session.list", f"Invalid status: {status}. Must be one of: all, {', '.join(SESSION_STATUSES)}")
             payload["status"] = status
-            
-        result = await self._make_request(payload)
         
-        # Check if response is in webhook handler format
-        if "results" in result and len(result.get("results", [])) > 0:
-            first_result = result["results"][0]
-            if first_result.get("success"):
-                data = first_result.get("data", {})
-                # v2.0.0: data is wrapped in data.sessions
-                sessions = data.get("sessions", [])
-                
-                return {
-                    "message": "Webhook processed",
-                    "event": "session.list",
-                    "handlerCount": 1,
-                    "results": [{
-                        "success": True,
-                        "data": {
-                            "sessions": sessions
-                        }
-                    }]
-                }
-            else:
-                return result  # Return error response as-is
-        else:
-            # Fallback for unexpected response format
-            return {
-                "message": "Webhook processed",
-                "event": "session.list",
-                "handlerCount": 1,
-                "results": [{
-                    "success": False,
-                    "error": "Unexpected response format from API"
-                }]
-            }
+        result = await self._make_request(
+            payload,
+            cache_ttl=LIST_CACHE_TTL,
+            etag_key=f"session.list:{payload.get('status', '')}"
+        )
+        
+        def transform(data: Dict[str, Any]) -> Dict[str, Any]:
+            # v2.0.0: data is wrapped in data.sessions
+            sessions = data.get("sessions", [])
+            if "status" in payload:
+                # Filter here too, for an API that ignores the status field
+                matching = [s for s in sessions if s.get("status") == status]
+                if len(matching) < len(sessions):
+                    sessions = matching
+            if data.keys() == {"sessions"} and sessions is data["sessions"]:
+                return data
+            return {"sessions": sessions}
+        
+        return _unwrap(result, "session.list", transform)
     
     async def wait_for_session(
         self,
         session_id: str,
         timeout_seconds: int = 3600,
-        poll_interval_seconds: int = 10
+        poll_interval_seconds: int = 10,
+        long_poll_seconds: int = 25,
+        on_status: Optional[Callable[[str], None]] = None
     ) -> Dict[str, Any]:
-        """Wait for a session to complete with polling"""
+        """Wait for a session to complete
+        
+        Each status check asks the server to hold the request open for up to
+        long_poll_seconds until the session changes state. Servers without
+        long-poll support answer straight away, in which case polling starts
+        at POLL_INITIAL_INTERVAL and backs off exponentially (with jitter) up
+        to poll_interval_seconds, restarting whenever the status changes.
+        While the API answers 429/5xx or cannot be reached, waiting continues
+        with the backoff allowed to grow to twice poll_interval_seconds.
         
-        start_time = asyncio.get_event_loop().time()
+        When CLAUDE_HUB_EVENTS_URL names a server-sent event stream for the
+        session, status changes are followed there instead and polling only
+        confirms the final state, or takes over if the stream drops or goes
+        EVENTS_IDLE_TIMEOUT seconds without a status event.
+        
+        Concurrent waits for the same session share one poller, which runs
+        with the options of the wait that started it. A caller whose own
+        timeout is longer carries on with a poller of its own if that one
+        times out first.
+        
+        on_status, if given, is called with each new status as it is seen.
+        """
+        
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout_seconds
         
         while True:
-            # Check if timeout exceeded
-            if asyncio.get_event_loop().time() - start_time > timeout_seconds:
-                return {
-                    "message": "Webhook processed",
-                    "event": "wait_for_session",
-                    "handlerCount": 1,
-                    "results": [{
-                        "success": False,
-                        "error": f"Session {session_id} did not complete within {timeout_seconds} seconds"
-                    }]
-                }
+            shared = self._waits.get(session_id)
+            # Tasks can only be awaited from the loop that runs them
+            started = shared is None or shared["task"].done() or shared["task"].get_loop() is not loop
+            if started:
+                shared = self._start_shared_wait(
+                    session_id, deadline - loop.time(), poll_interval_seconds, long_poll_seconds
+                )
+            elif on_status and shared["status"] is not None:
+                on_status(shared["status"])
+            
+            task = shared["task"]
+            if on_status:
+                shared["listeners"].append(on_status)
+            shared["waiters"] += 1
+            try:
+                if started:
+                    result = await asyncio.shield(task)
+                else:
+                    result = await asyncio.wait_for(asyncio.shield(task), max(deadline - loop.time(), 0))
+            except asyncio.TimeoutError:
+                result = None
+            finally:
+                shared["waiters"] -= 1
+                if on_status:
+                    shared["listeners"].remove(on_status)
+                # Nobody is left to report to
+                if shared["waiters"] == 0 and not task.done():
+                    task.cancel()
             
+            if result is not None:
+                return result
+            # The shared wait gave up at its deadline, which was earlier than ours
+            if loop.time() < deadline:
+                continue
+            return _envelope("wait_for_session", {
+                "success": False,
+                "error": f"Session {session_id} did not complete within {timeout_seconds} seconds"
+            })
+    
+    def _start_shared_wait(
+        self,
+        session_id: str,
+        timeout_seconds: float,
+        poll_interval_seconds: int,
+        long_poll_seconds: int
+    ) -> Dict[str, Any]:
+        """Start polling a session on behalf of every concurrent waiter"""
+        loop = asyncio.get_running_loop()
+        shared: Dict[str, Any] = {
+            "listeners": [],
+            "waiters": 0,
+            "status": None
+        }
+        
+        def on_status(status: str) -> None:
+            shared["status"] = status
+            for listener in list(shared["listeners"]):
+                listener(status)
+        
+        task = loop.create_task(self._poll_session(
+            session_id, timeout_seconds, poll_interval_seconds, long_poll_seconds, on_status
+        ))
+        shared["task"] = task
+        self._waits[session_id] = shared
+        
+        def _done(finished: asyncio.Task) -> None:
+            if self._waits.get(session_id) is shared:
+                del self._waits[session_id]
+        
+        task.add_done_callback(_done)
+        return shared
+    
+    async def _poll_session(
+        self,
+        session_id: str,
+        timeout_seconds: float,
+        poll_interval_seconds: int,
+        long_poll_seconds: int,
+        on_status: Callable[[str], None]
+    ) -> Optional[Dict[str, Any]]:
+        """Poll a session until it finishes, or return None once timeout_seconds pass"""
+        
+        clock = asyncio.get_running_loop().time
+        start_time = clock()
+        deadline = start_time + timeout_seconds
+        delay = POLL_INITIAL_INTERVAL
+        last_status = await self._follow_events(session_id, timeout_seconds, on_status)
+        
+        while True:
             # Get session status
-            status_response = await self.get_session_status(session_id)
+            request_start = clock()
+            remaining = deadline - request_start
+            throttled = False
+            status_response = await self.get_session_status(
+                session_id, wait_seconds=min(long_poll_seconds, max(remaining, 0))
+            )
             
             # Extract session status from webhook response
-            if "results" in status_response and len(status_response.get("results", [])) > 0:
-                first_result = status_response["results"][0]
-                if first_result.get("success"):
-                    session = first_result.get("data", {}).get("session", {})
-                    session_status = session.get("status")
-                    
-                    if session_status in ["completed", "failed"]:
-                        # Get final output if completed
-                        if session_status == "completed":
-                            output_response = await self.get_session_output(session_id)
-                            if "results" in output_response and len(output_response.get("results", [])) > 0:
-                                output_result = output_response["results"][0]
-                                if output_result.get("success"):
-                                    return {
-                                        "message": "Webhook processed",
-                                        "event": "wait_for_session",
-                                        "handlerCount": 1,
-                                        "results": [{
-                                            "success": True,
-                                            "data": {
-                                                "sessionId": session_id,
-                                                "status": "completed",
-                                                "durationSeconds": int(asyncio.get_event_loop().time() - start_time),
-                                                "output": output_result.get("data", {}).get("output", {})
-                                            }
-                                        }]
-                                    }
+            first_result = _first_result(status_response)
+            if first_result.get("success"):
+                session = first_result.get("data", {}).get("session", {})
+                session_status = session.get("status")
+                
+                # Poll quickly again after any state change
+                if session_status != last_status:
+                    last_status = session_status
+                    delay = POLL_INITIAL_INTERVAL
+                    if on_status:
+                        on_status(session_status)
+                
+                if session_status in TERMINAL_STATUSES:
+                    # Get final output if completed, unless the status already carries it
+                    if session_status == "completed":
+                        if session.get("output"):
+                            output = {"output": _normalize_output(session["output"])}
                         else:
-                            return {
-                                "message": "Webhook processed",
-                                "event": "wait_for_session",
-                                "handlerCount": 1,
-                                "results": [{
-                                    "success": True,
-                                    "data": {
-                                        "sessionId": session_id,
-                                        "status": "failed",
-                                        "error": "Session failed",
-                                        "durationSeconds": int(asyncio.get_event_loop().time() - start_time)
-                                    }
-                                }]
+                            output = _success_data(await self.get_session_output(session_id))
+                        if output is not None:
+                            return _envelope("wait_for_session", {
+                                "success": True,
+                                "data": {
+                                    "sessionId": session_id,
+                                    "status": "completed",
+                                    "durationSeconds": int(clock() - start_time),
+                                    "output": output.get("output", {})
+                                }
+                            })
+                    else:
+                        return _envelope("wait_for_session", {
+                            "success": True,
+                            "data": {
+                                "sessionId": session_id,
+                                "status": "failed",
+                                "error": "Session failed",
+                                "durationSeconds": int(clock() - start_time)
                             }
-                else:
-                    return status_response  # Return error response
+                        })
+            elif first_result.get("retryable"):
+                # The API is overloaded or unreachable; keep waiting but back off harder
+                throttled = True
+            else:
+                return status_response  # Return error response
+            
+            # Check if timeout exceeded. This comes after the status check so
+            # a session that is already done is reported even with no time left.
+            now = clock()
+            if now >= deadline:
+                return None
             
-            # Wait before next poll
-            await asyncio.sleep(poll_interval_seconds)
+            # Wait before next poll, unless the server already held the request,
+            # without sleeping past the deadline
+            max_delay = poll_interval_seconds * 2 if throttled else poll_interval_seconds
+            sleep_for = min(max_delay, delay * random.uniform(1 - POLL_JITTER, 1 + POLL_JITTER))
+            delay = min(max_delay, delay * POLL_BACKOFF_FACTOR)
+            sleep_for = min(sleep_for - (now - request_start), deadline - now)
+            if sleep_for > 0:
+                await asyncio.sleep(sleep_for)
+    
+    async def _stream_events(self, session_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the session updates of the API's server-sent status events"""
+        client = self._get_client()
+        
+        clock = asyncio.get_running_loop().time
+        
+        # Held open for the whole wait, so it does not take a request slot
+        async with client.stream(
+            "GET",
+            self.events_url.format(session_id=quote(session_id, safe="")),
+            headers={"Accept": "text/event-stream"},
+            timeout=httpx.Timeout(30.0, connect=5.0, read=EVENTS_IDLE_TIMEOUT)
+        ) as response:
+            response.raise_for_status()
+            if not response.headers.get("Content-Type", "").startswith("text/event-stream"):
+                self._events_supported = False
+                return
+            event, data = "message", []
+            last_status_at = clock()
+            async for line in response.aiter_lines():
+                if line.startswith("event:"):
+                    event = line[6:].strip()
+                elif line.startswith("data:"):
+                    data.append(line[5:].lstrip())
+                elif not line:
+                    if event == "status" and data:
+                        yield _loads("\n".join(data))
+                        last_status_at = clock()
+                    event, data = "message", []
+                # Other traffic alone doesn't keep the wait on the stream;
+                # hand over to polling if no status arrives for a while
+                if clock() - last_status_at > EVENTS_IDLE_TIMEOUT:
+                    return
+    
+    async def _follow_events(
+        self,
+        session_id: str,
+        timeout: float,
+        on_status: Optional[Callable[[str], None]] = None
+    ) -> Optional[str]:
+        """Follow a session's status events until it finishes or the stream ends
+        
+        Returns the last status seen. Stream errors are swallowed so the caller
+        can fall back to polling; an API without an events endpoint is not
+        asked again.
+        """
+        if not self.events_url or self._events_supported is False:
+            return None
+        
+        last_status = None
+        
+        async def follow():
+            nonlocal last_status
+            async for session in self._stream_events(session_id):
+                self._events_supported = True
+                status = session.get("status")
+                if status != last_status:
+                    last_status = status
+                    if on_status:
+                        on_status(status)
+                if status in TERMINAL_STATUSES:
+                    return
+        
+        try:
+            await asyncio.wait_for(follow(), timeout)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code < 500:
+                self._events_supported = False
+        except (httpx.HTTPError, asyncio.TimeoutError, ValueError):
+            pass
+        return last_status
+    
+    async def wait_for_sessions(
+        self,
+        session_ids: List[str],
+        timeout_seconds: int = 3600,
+        poll_interval_seconds: int = 10
+    ) -> Dict[str, Any]:
+        """Wait for several sessions to complete
+        
+        All sessions are tracked with a single session.list request per poll
+        instead of one status request each; a session the list doesn't show is
+        looked up on its own, so an unknown ID fails at once. Outputs of
+        completed sessions are fetched concurrently once every session has
+        finished.
+        """
+        
+        clock = asyncio.get_running_loop().time
+        start_time = clock()
+        deadline = start_time + timeout_seconds
+        delay = POLL_INITIAL_INTERVAL
+        pending = set(session_ids)
+        finished: Dict[str, Dict[str, Any]] = {}
+        
+        while True:
+            throttled = False
+            progressed = False
+            list_response = await self.list_sessions()
+            list_data = _success_data(list_response)
+            if list_data is None:
+                if not _first_result(list_response).get("retryable"):
+                    return list_response  # Return error response
+                # The API is overloaded or unreachable; keep waiting but back off harder
+                throttled = True
+            else:
+                statuses = {session.get("id"): session.get("status") for session in list_data.get("sessions", [])}
+                missing = sorted(pending - statuses.keys())
+                lookups = await asyncio.gather(*(self.get_session_status(sid) for sid in missing))
+                for session_id, status_response in zip(missing, lookups):
+                    first_result = _first_result(status_response)
+                    if first_result.get("success"):
+                        statuses[session_id] = first_result.get("data", {}).get("session", {}).get("status")
+                    elif first_result.get("retryable"):
+                        throttled = True
+                    else:
+                        return status_response  # Return error response
+                
+                for session_id in sorted(pending):
+                    if statuses.get(session_id) in TERMINAL_STATUSES:
+                        pending.discard(session_id)
+                        finished[session_id] = {"sessionId": session_id, "status": statuses[session_id]}
+                        progressed = True
+            
+            now = clock()
+            
+            if not pending:
+                completed = [sid for sid in session_ids if finished[sid]["status"] == "completed"]
+                outputs = await asyncio.gather(*(self.get_session_output(sid) for sid in completed))
+                for session_id, output_response in zip(completed, outputs):
+                    output = _success_data(output_response)
+                    if output is not None:
+                        finished[session_id]["output"] = output.get("output", {})
+                for session in finished.values():
+                    if session["status"] == "failed":
+                        session["error"] = "Session failed"
+                
+                return _envelope("wait_for_sessions", {
+                    "success": True,
+                    "data": {
+                        "sessions": [finished[sid] for sid in session_ids],
+                        "durationSeconds": int(now - start_time)
+                    }
+                })
+            
+            if now >= deadline:
+                return _envelope("wait_for_sessions", {
+                    "success": False,
+                    "error": f"Sessions {', '.join(sorted(pending))} did not complete within {timeout_seconds} seconds",
+                    "data": {
+                        "sessions": list(finished.values())
+                    }
+                })
+            
+            # Back off between polls, starting over when any session finishes
+            if progressed:
+                delay = POLL_INITIAL_INTERVAL
+            max_delay = poll_interval_seconds * 2 if throttled else poll_interval_seconds
+            sleep_for = min(max_delay, delay * random.uniform(1 - POLL_JITTER, 1 + POLL_JITTER))
+            delay = min(max_delay, delay * POLL_BACKOFF_FACTOR)
+            await asyncio.sleep(min(sleep_for, deadline - now))
     
     async def cleanup(self):
         """Cleanup resources"""
-        if self.client:
+        loop = asyncio.get_running_loop()
+        client = self._loop_clients.pop(loop, None)
+        if client:
+            await client.aclose()
+        if self.client and self._client_loop in (None, loop):
             await self.client.aclose()
+            self.client = None
+            self._client_loop = None
 
 
 # Initialize the orchestration client
 orchestration = ClaudeOrchestrationMCP()
 
 
+# Event loop shared by every sync call, run in a background thread so the
+# httpx connection pool and cached responses outlive a single call
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_thread: Optional[threading.Thread] = None
+_loop_lock = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Get the background event loop, starting it on first use"""
+    global _loop, _loop_thread
+    with _loop_lock:
+        if _loop is None:
+            _loop = _new_event_loop()
+            _loop_thread = threading.Thread(target=_loop.run_forever, name="claude-hub-loop", daemon=True)
+            _loop_thread.start()
+        return _loop
+
+
 # Helper function to run async functions in sync context
 def run_async(coro):
-    """Run an async coroutine in a synchronous context, handling event loop issues"""
-    try:
-        # Check if there's already a running event loop
-        loop = asyncio.get_running_loop()
-        # If we have a running loop, use ThreadPoolExecutor to run in a new thread
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            future = executor.submit(asyncio.run, coro)
-            return future.result()
-    except RuntimeError:
-        # No event loop running, use asyncio.run normally
-        return asyncio.run(coro)
+    """Run an async coroutine in a synchronous context
+    
+    The coroutine runs on the shared background loop, whether or not the
+    caller has an event loop of its own. Must not be called from the
+    background loop itself, which would wait on itself forever.
+    """
+    if threading.current_thread() is _loop_thread:
+        coro.close()
+        raise RuntimeError("run_async cannot be called from the background event loop; await the coroutine instead")
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
+
+
+def _on_loop(coro) -> "asyncio.Future":
+    """Schedule a coroutine on the background loop and return an awaitable for its result"""
+    return asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, _get_loop()))
+
+
+def _split_ids(value: str) -> List[str]:
+    """Split a comma-separated list of session IDs, dropping blanks and 'none'"""
+    return [item for item in map(str.strip, value.split(",")) if item and item.lower() != "none"]
 
 
-# Gradio wrapper functions for async methods
-def create_session_sync(session_type, repository, requirements, context="", branch="", dependencies="", auto_start=True, timeout_minutes=60):
-    """Synchronous wrapper for create_session
+# Gradio handlers for the async methods. Gradio awaits them on its own loop,
+# so no worker thread is held while a request is in flight; the API calls
+# themselves run on the background loop that owns the connection pool.
+async def create_session_sync(
+    session_type: str,
+    repository: str,
+    requirements: str,
+    context: str = "",
+    branch: str = "",
+    dependencies: str = "",
+    auto_start: bool = True,
+    timeout_minutes: float = 60
+) -> str:
+    """Create a new Claude Code session
     
     Args:
         session_type: Type of session (implementation, analysis, testing, review, coordination)
@@ -569,9 +1323,9 @@ def create_session_sync(session_type, repository, requirements, context="", bran
         auto_start: Whether to automatically start the session when dependencies are met
         timeout_minutes: Maximum runtime in minutes
     """
-    deps_list = [d.strip() for d in dependencies.split(",") if d.strip()] if dependencies else None
+    deps_list = _split_ids(dependencies) if dependencies else None
     
-    result = run_async(orchestration.create_session(
+    result = await _on_loop(orchestration.create_session(
         session_type, 
         repository, 
         requirements, 
@@ -582,182 +1336,226 @@ def create_session_sync(session_type, repository, requirements, context="", bran
         timeout_minutes if timeout_minutes else None
     ))
     
-    return json.dumps(result, indent=2)
+    return _format(result)
 
 
-def start_session_sync(session_id: str) -> str:
-    """Synchronous wrapper for start_session"""
-    result = run_async(orchestration.start_session(session_id))
-    return json.dumps(result, indent=2)
+async def create_sessions_sync(specs: str) -> str:
+    """Create several sessions at once
+    
+    Args:
+        specs: JSON array of objects with the create_session arguments (session_type, repository, requirements, ...)
+    """
+    try:
+        spec_list = _loads(specs)
+    except ValueError as e:
+        return _format(_failure("create_sessions", f"Invalid JSON: {e}"))
+    if not isinstance(spec_list, list) or not all(isinstance(spec, dict) for spec in spec_list):
+        return _format(_failure("create_sessions", "Expected a JSON array of session objects"))
+    
+    result = await _on_loop(orchestration.create_sessions(spec_list))
+    return _format(result)
 
 
-def get_session_status_sync(session_id: str) -> str:
-    """Synchronous wrapper for get_session_status"""
-    result = run_async(orchestration.get_session_status(session_id))
-    return json.dumps(result, indent=2)
+async def start_session_sync(session_id: str) -> str:
+    """Start a previously created session"""
+    result = await _on_loop(orchestration.start_session(session_id))
+    return _format(result)
 
 
-def get_session_output_sync(session_id: str) -> str:
-    """Synchronous wrapper for get_session_output"""
-    result = run_async(orchestration.get_session_output(session_id))
-    return json.dumps(result, indent=2)
+async def get_session_status_sync(session_id: str) -> str:
+    """Get the current status and details of a session"""
+    result = await _on_loop(orchestration.get_session_status(session_id))
+    return _format(result)
 
 
-def list_sessions_sync(status: str = "all") -> str:
-    """Synchronous wrapper for list_sessions"""
-    result = run_async(orchestration.list_sessions(
+async def get_sessions_status_sync(session_ids: str) -> str:
+    """Get the status of several sessions at once
+    
+    Args:
+        session_ids: Comma-separated list of session IDs
+    """
+    ids = _split_ids(session_ids)
+    result = await _on_loop(orchestration.get_sessions_status(ids))
+    return _format(result)
+
+
+async def get_session_output_sync(session_id: str) -> str:
+    """Get the output of a session"""
+    result = await _on_loop(orchestration.get_session_output(session_id))
+    return _format(result)
+
+
+async def list_sessions_sync(status: str = "all") -> str:
+    """List all sessions, optionally filtered by status"""
+    result = await _on_loop(orchestration.list_sessions(
         status if status != "all" else None
     ))
-    return json.dumps(result, indent=2)
+    return _format(result)
 
 
-def wait_for_session_sync(session_id: str, timeout_seconds: float = 3600, poll_interval_seconds: float = 10) -> str:
-    """Synchronous wrapper for wait_for_session"""
-    result = run_async(orchestration.wait_for_session(
-        session_id, int(timeout_seconds), int(poll_interval_seconds)
+async def wait_for_session_sync(session_id: str, timeout_seconds: float = 3600, poll_interval_seconds: float = 10) -> AsyncIterator[str]:
+    """Wait for a session to complete, reporting each status change along the way"""
+    loop = asyncio.get_running_loop()
+    updates: asyncio.Queue = asyncio.Queue()
+    
+    def on_status(status: str) -> None:
+        # Called on the background loop; hand the update over to ours
+        loop.call_soon_threadsafe(updates.put_nowait, status)
+    
+    done = _on_loop(orchestration.wait_for_session(
+        session_id, int(timeout_seconds), int(poll_interval_seconds), on_status=on_status
     ))
-    return json.dumps(result, indent=2)
+    try:
+        while not done.done():
+            update = asyncio.ensure_future(updates.get())
+            await asyncio.wait({update, done}, return_when=asyncio.FIRST_COMPLETED)
+            if update.done():
+                yield _format({"sessionId": session_id, "status": update.result()})
+            else:
+                update.cancel()
+        yield _format(done.result())
+    finally:
+        # Stop waiting upstream if the client goes away
+        done.cancel()
+
+
+async def wait_for_sessions_sync(session_ids: str, timeout_seconds: float = 3600, poll_interval_seconds: float = 10) -> str:
+    """Wait for several sessions to complete
+    
+    Args:
+        session_ids: Comma-separated list of session IDs
+        timeout_seconds: Maximum time to wait for all of them
+        poll_interval_seconds: Longest pause between checks
+    """
+    ids = _split_ids(session_ids)
+    done = _on_loop(orchestration.wait_for_sessions(ids, int(timeout_seconds), int(poll_interval_seconds)))
+    try:
+        return _format(await done)
+    finally:
+        # Stop waiting upstream if the client goes away
+        done.cancel()
+
+
+# Gradio tabs: (title, button label, handler, result lines, input components).
+# Inputs are (component class, keyword arguments), created inside the Blocks
+# context and passed to the handler in order.
+SESSION_ID_INPUT = (gr.Textbox, {"label": "Session ID"})
+
+GRADIO_TABS = [
+    ("Create Session", "Create Session", create_session_sync, 10, [
+        (gr.Dropdown, {
+            "choices": ["implementation", "analysis", "testing", "review", "coordination"],
+            "label": "Session Type",
+            "value": "implementation"
+        }),
+        (gr.Textbox, {"label": "Repository (owner/repo)", "placeholder": "owner/repo"}),
+        (gr.Textbox, {
+            "label": "Requirements",
+            "lines": 5,
+            "placeholder": "Detailed requirements for this session..."
+        }),
+        (gr.Textbox, {
+            "label": "Context (optional)",
+            "lines": 3,
+            "placeholder": "Additional context about the project..."
+        }),
+        (gr.Textbox, {
+            "label": "Branch (optional)",
+            "placeholder": "feature/new-feature"
+        }),
+        (gr.Textbox, {
+            "label": "Dependencies (optional, comma-separated session IDs)",
+            "placeholder": "session-id-1, session-id-2",
+            "info": "Enter session IDs that must complete before this session starts"
+        }),
+        (gr.Checkbox, {
+            "label": "Auto Start",
+            "value": True,
+            "info": "Automatically start session when dependencies are met"
+        }),
+        (gr.Number, {
+            "label": "Timeout (minutes)",
+            "value": 60,
+            "info": "Maximum runtime before session is terminated"
+        })
+    ]),
+    ("Bulk Create", "Create Sessions", create_sessions_sync, 15, [
+        (gr.Textbox, {
+            "label": "Sessions (JSON array)",
+            "lines": 8,
+            "placeholder": '[{"session_type": "implementation", "repository": "owner/repo", "requirements": "..."}]'
+        })
+    ]),
+    ("Start Session", "Start Session", start_session_sync, 10, [SESSION_ID_INPUT]),
+    ("Get Status", "Get Status", get_session_status_sync, 10, [SESSION_ID_INPUT]),
+    ("Batch Status", "Get Statuses", get_sessions_status_sync, 15, [
+        (gr.Textbox, {"label": "Session IDs (comma-separated)"})
+    ]),
+    ("Get Output", "Get Output", get_session_output_sync, 15, [SESSION_ID_INPUT]),
+    ("List Sessions", "List Sessions", list_sessions_sync, 15, [
+        (gr.Dropdown, {
+            "choices": ["all", *SESSION_STATUSES],
+            "label": "Status Filter",
+            "value": "all"
+        })
+    ]),
+    ("Wait for Session", "Wait for Completion", wait_for_session_sync, 15, [
+        SESSION_ID_INPUT,
+        (gr.Number, {"label": "Timeout (seconds)", "value": 3600}),
+        (gr.Number, {"label": "Poll Interval (seconds)", "value": 10})
+    ]),
+    ("Wait for Sessions", "Wait for All", wait_for_sessions_sync, 15, [
+        (gr.Textbox, {"label": "Session IDs (comma-separated)"}),
+        (gr.Number, {"label": "Timeout (seconds)", "value": 3600}),
+        (gr.Number, {"label": "Poll Interval (seconds)", "value": 10})
+    ])
+]
 
 
 # Create Gradio interface
-def create_gradio_interface():
-    """Create the Gradio interface for the MCP server"""
+def create_gradio_interface(with_ui: Optional[bool] = None):
+    """Create the Gradio interface for the MCP server
+    
+    Args:
+        with_ui: Build the web UI tabs. Defaults to the MCP_ENABLE_UI environment
+            variable (on unless set to 0/false); without the UI the handlers are
+            only registered as API endpoints, which is all the MCP server needs.
+    """
+    if with_ui is None:
+        with_ui = os.getenv("MCP_ENABLE_UI", "1").lower() not in ("0", "false", "no")
     
     with gr.Blocks(title="Claude Orchestration MCP Server") as demo:
+        if not with_ui:
+            for _, _, handler, _, _ in GRADIO_TABS:
+                gr.api(handler)
+            return _queue(demo)
+        
         gr.Markdown("# Claude Orchestration MCP Server")
         gr.Markdown("Orchestrate multiple Claude Code sessions for complex software projects")
         
-        with gr.Tab("Create Session"):
-            with gr.Row():
-                with gr.Column():
-                    session_type = gr.Dropdown(
-                        choices=["implementation", "analysis", "testing", "review", "coordination"],
-                        label="Session Type",
-                        value="implementation"
-                    )
-                    repository = gr.Textbox(label="Repository (owner/repo)", placeholder="owner/repo")
-                    requirements = gr.Textbox(
-                        label="Requirements",
-                        lines=5,
-                        placeholder="Detailed requirements for this session..."
-                    )
-                    context = gr.Textbox(
-                        label="Context (optional)",
-                        lines=3,
-                        placeholder="Additional context about the project..."
-                    )
-                    branch = gr.Textbox(
-                        label="Branch (optional)",
-                        placeholder="feature/new-feature"
-                    )
-                    dependencies = gr.Textbox(
-                        label="Dependencies (optional, comma-separated session IDs)",
-                        placeholder="session-id-1, session-id-2",
-                        info="Enter session IDs that must complete before this session starts"
-                    )
-                    auto_start = gr.Checkbox(
-                        label="Auto Start",
-                        value=True,
-                        info="Automatically start session when dependencies are met"
-                    )
-                    timeout_minutes = gr.Number(
-                        label="Timeout (minutes)",
-                        value=60,
-                        info="Maximum runtime before session is terminated"
-                    )
-                    create_btn = gr.Button("Create Session", variant="primary")
-                
-                with gr.Column():
-                    create_output = gr.Textbox(label="Result", lines=10)
-            
-            create_btn.click(
-                create_session_sync,
-                inputs=[session_type, repository, requirements, context, branch, dependencies, auto_start, timeout_minutes],
-                outputs=create_output
-            )
-        
-        with gr.Tab("Start Session"):
-            with gr.Row():
-                with gr.Column():
-                    start_session_id = gr.Textbox(label="Session ID")
-                    start_btn = gr.Button("Start Session", variant="primary")
-                
-                with gr.Column():
-                    start_output = gr.Textbox(label="Result", lines=10)
-            
-            start_btn.click(
-                start_session_sync,
-                inputs=start_session_id,
-                outputs=start_output
-            )
-        
-        with gr.Tab("Get Status"):
-            with gr.Row():
-                with gr.Column():
-                    status_session_id = gr.Textbox(label="Session ID")
-                    status_btn = gr.Button("Get Status", variant="primary")
-                
-                with gr.Column():
-                    status_output = gr.Textbox(label="Result", lines=10)
-            
-            status_btn.click(
-                get_session_status_sync,
-                inputs=status_session_id,
-                outputs=status_output
-            )
-        
-        with gr.Tab("Get Output"):
-            with gr.Row():
-                with gr.Column():
-                    output_session_id = gr.Textbox(label="Session ID")
-                    output_btn = gr.Button("Get Output", variant="primary")
-                
-                with gr.Column():
-                    output_output = gr.Textbox(label="Result", lines=15)
-            
-            output_btn.click(
-                get_session_output_sync,
-                inputs=output_session_id,
-                outputs=output_output
-            )
-        
-        with gr.Tab("List Sessions"):
-            with gr.Row():
-                with gr.Column():
-                    list_status = gr.Dropdown(
-                        choices=["all", "pending", "initializing", "queued", "running", "completed", "failed", "cancelled"],
-                        label="Status Filter",
-                        value="all"
-                    )
-                    list_btn = gr.Button("List Sessions", variant="primary")
-                
-                with gr.Column():
-                    list_output = gr.Textbox(label="Result", lines=15)
-            
-            list_btn.click(
-                list_sessions_sync,
-                inputs=[list_status],
-                outputs=list_output
-            )
-        
-        with gr.Tab("Wait for Session"):
-            with gr.Row():
-                with gr.Column():
-                    wait_session_id = gr.Textbox(label="Session ID")
-                    wait_timeout = gr.Number(label="Timeout (seconds)", value=3600)
-                    wait_interval = gr.Number(label="Poll Interval (seconds)", value=10)
-                    wait_btn = gr.Button("Wait for Completion", variant="primary")
+        for title, button_label, handler, result_lines, input_specs in GRADIO_TABS:
+            with gr.Tab(title):
+                with gr.Row():
+                    with gr.Column():
+                        inputs = [component(**kwargs) for component, kwargs in input_specs]
+                        button = gr.Button(button_label, variant="primary")
+                    
+                    with gr.Column():
+                        output = gr.Textbox(label="Result", lines=result_lines)
                 
-                with gr.Column():
-                    wait_output = gr.Textbox(label="Result", lines=15)
-            
-            wait_btn.click(
-                wait_for_session_sync,
-                inputs=[wait_session_id, wait_timeout, wait_interval],
-                outputs=wait_output
-            )
+                button.click(handler, inputs=inputs, outputs=output)
     
-    return demo
+    return _queue(demo)
+
+
+def _queue(demo: gr.Blocks) -> gr.Blocks:
+    """Let many handlers run at once on Gradio's loop
+    
+    The handlers spend nearly all their time awaiting the API, so Gradio's
+    default of one running call per event would make every waiting user
+    block the next one.
+    """
+    return demo.queue(default_concurrency_limit=int(os.getenv("MCP_CONCURRENCY_LIMIT", "64")))
 
 
 # Main entry point
@@ -769,4 +1567,8 @@ if __name__ == "__main__":
     
     # Create and launch the interface
     demo = create_gradio_interface()
-    demo.launch(server_name="0.0.0.0", server_port=7860, share=False, mcp_server=True)
\ No newline at end of file
+    try:
+        demo.launch(server_name="0.0.0.0", server_port=7860, share=False, mcp_server=True)
+    finally:
+        # Close pooled connections to the API on shutdown
+        run_async(orchestration.cleanup())
\ No newline at end of file
@@ -17,61 +17,60 @@ async def test_create_sessions():
     
     sessions = []
     
-    # Test 1: Create first session
-    print("Creating first session...")
+    # Test 1 and 2: Create both sessions in one bulk request
+    print("Creating sessions...")
     try:
-        result1 = await orchestration.create_session(
-            session_type="implementation",
-            repository="Cheffromspace/demo-repository",
-            requirements="Create a simple Python tutorial demonstrating basic concepts like variables, functions, and loops",
-            context="Test of MCP tools - Python basics tutorial",
-            dependencies=["python3"]
-        )
-        print(f"Session 1 created: {result1}")
+        result = await orchestration.create_sessions([
+            {
+                "session_type": "implementation",
+                "repository": "Cheffromspace/demo-repository",
+                "requirements": "Create a simple Python tutorial demonstrating basic concepts like variables, functions, and loops",
+                "context": "Test of MCP tools - Python basics tutorial",
+                "dependencies": ["python3"]
+            },
+            {
+                "session_type": "implementation",
+                "repository": "Cheffromspace/demo-repository",
+                "requirements": "Create a Python tutorial on working with lists, dictionaries, and file I/O operations",
+                "context": "Test of MCP tools - Data structures tutorial",
+                "dependencies": ["python3", "requests"]
+            }
+        ])
+        print(f"Sessions created: {result}")
         
-        if result1.get("results", [{}])[0].get("success"):
-            session1_id = result1["results"][0]["data"]["session"]["id"]
-            sessions.append(session1_id)
-            print(f"Session 1 ID: {session1_id}")
+        if result.get("results", [{}])[0].get("success"):
+            for number, session in enumerate(result["results"][0]["data"]["sessions"], 1):
+                if "id" in session:
+                    sessions.append(session["id"])
+                    print(f"Session {number} ID: {session['id']}")
+                else:
+                    print(f"Error creating session {number}: {session.get('error')}")
     except Exception as e:
-        print(f"Error creating session 1: {e}")
-    
-    # Test 2: Create second session
-    print("\nCreating second session...")
-    try:
-        result2 = await orchestration.create_session(
-            session_type="implementation",
-            repository="Cheffromspace/demo-repository",
-            requirements="Create a Python tutorial on working with lists, dictionaries, and file I/O operations",
-            context="Test of MCP tools - Data structures tutorial",
-            dependencies=["python3", "requests"]
-        )
-        print(f"Session 2 created: {result2}")
-        
-        if result2.get("results", [{}])[0].get("success"):
-            session2_id = result2["results"][0]["data"]["session"]["id"]
-            sessions.append(session2_id)
-            print(f"Session 2 ID: {session2_id}")
-    except Exception as e:
-        print(f"Error creating session 2: {e}")
+        print(f"Error creating sessions: {e}")
     
     # Test 3: Start sessions
-    for session_id in sessions:
-        print(f"\nStarting session {session_id}...")
-        try:
-            start_result = await orchestration.start_session(session_id)
-            print(f"Start result: {start_result}")
-        except Exception as e:
-            print(f"Error starting session: {e}")
+    print(f"\nStarting sessions {sessions}...")
+    start_results = await asyncio.gather(
+        *(orchestration.start_session(session_id) for session_id in sessions),
+        return_exceptions=True
+    )
+    for session_id, start_result in zip(sessions, start_results):
+        if isinstance(start_result, Exception):
+            print(f"Error starting session {session_id}: {start_result}")
+        else:
+            print(f"Start result for {session_id}: {start_result}")
     
     # Test 4: Get status
-    for session_id in sessions:
-        print(f"\nGetting status for session {session_id}...")
-        try:
-            status_result = await orchestration.get_session_status(session_id)
-            print(f"Status result: {status_result}")
-        except Exception as e:
-            print(f"Error getting status: {e}")
+    print(f"\nGetting status for sessions {sessions}...")
+    status_results = await asyncio.gather(
+        *(orchestration.get_session_status(session_id) for session_id in sessions),
+        return_exceptions=True
+    )
+    for session_id, status_result in zip(sessions, status_results):
+        if isinstance(status_result, Exception):
+            print(f"Error getting status for {session_id}: {status_result}")
+        else:
+            print(f"Status result for {session_id}: {status_result}")
     
     return sessions
 
@@ -1,18 +1,28 @@
 #!/usr/bin/env python3
 """Simple unit tests for Claude Orchestration MCP Server"""
 
-import unittest
 import asyncio
-from mcp_server import ClaudeOrchestrationMCP
+import json
+import unittest
+from unittest import mock
+
+import httpx
 
+import mcp_server
+from mcp_server import VALID_SESSION_TYPES, ClaudeOrchestrationMCP
 
-class TestClaudeOrchestrationMCP(unittest.TestCase):
+
+class TestClaudeOrchestrationMCP(unittest.IsolatedAsyncioTestCase):
     """Basic unit tests without mocking"""
     
-    def setUp(self):
-        """Set up test client"""
+    async def asyncSetUp(self):
+        """Set up test client on the test's event loop"""
         self.client = ClaudeOrchestrationMCP()
     
+    async def asyncTearDown(self):
+        """Close any connections the test opened"""
+        await self.client.cleanup()
+    
     def test_initialization(self):
         """Test that the client initializes correctly"""
         self.assertIsNotNone(self.client.api_url)
@@ -24,8 +34,9 @@ class TestClaudeOrchestrationMCP(unittest.TestCase):
         valid_types = ["implementation", "analysis", "testing", "review", "coordination"]
         
         for session_type in valid_types:
-            # Just verify the type is in our list
-            self.assertIn(session_type, valid_types)
+            # Verify the server accepts each documented type
+            self.assertIn(session_type, VALID_SESSION_TYPES)
+        self.assertEqual(len(VALID_SESSION_TYPES), len(valid_types))
         
         print("✅ Session types test passed")
     
@@ -65,93 +76,63 @@ class TestClaudeOrchestrationMCP(unittest.TestCase):
         self.assertIn("branch", project_data)
         print("✅ Optional fields test passed")
     
-    def test_invalid_session_type(self):
+    async def test_invalid_session_type(self):
         """Test that invalid session types are rejected"""
-        async def test():
-            result = await self.client.create_session(
-                session_type="invalid_type",
-                repository="owner/repo",
-                requirements="Test requirements"
-            )
-            self.assertFalse(result["results"][0]["success"])
-            self.assertIn("Invalid session type", result["results"][0]["error"])
-        
-        asyncio.run(test())
+        result = await self.client.create_session(
+            session_type="invalid_type",
+            repository="owner/repo",
+            requirements="Test requirements"
+        )
+        self.assertFalse(result["results"][0]["success"])
+        self.assertIn("Invalid session type", result["results"][0]["error"])
         print("✅ Invalid session type test passed")
     
-    def test_invalid_repository_format(self):
+    async def test_invalid_repository_format(self):
         """Test that invalid repository formats are rejected"""
-        async def test():
-            # Test missing slash
-            result = await self.client.create_session(
-                session_type="implementation",
-                repository="ownerrepo",
-                requirements="Test requirements"
-            )
-            self.assertFalse(result["results"][0]["success"])
-            self.assertIn("Invalid repository format", result["results"][0]["error"])
-            
-            # Test empty repository
-            result = await self.client.create_session(
-                session_type="implementation",
-                repository="",
-                requirements="Test requirements"
-            )
-            self.assertFalse(result["results"][0]["success"])
-            self.assertIn("Invalid repository format", result["results"][0]["error"])
-            
-            # Test multiple slashes
-            result = await self.client.create_session(
-                session_type="implementation",
-                repository="owner/repo/extra",
-                requirements="Test requirements"
-            )
-            self.assertFalse(result["results"][0]["success"])
-            self.assertIn("Invalid repository format", result["results"][0]["error"])
-            
-            # Test empty owner
-            result = await self.client.create_session(
-                session_type="implementation",
-                repository="/repo",
-                requirements="Test requirements"
-            )
-            self.assertFalse(result["results"][0]["success"])
-            self.assertIn("Invalid repository format", result["results"][0]["error"])
-            
-            # Test empty repo name
-            result = await self.client.create_session(
+        cases = [
+            "ownerrepo",         # missing slash
+            "",                  # empty repository
+            "owner/repo/extra",  # multiple slashes
+            "/repo",             # empty owner
+            "owner/",            # empty repo name
+        ]
+        
+        # Validation needs no network, so all cases can run at once
+        results = await asyncio.gather(*(
+            self.client.create_session(
                 session_type="implementation",
-                repository="owner/",
+                repository=repository,
                 requirements="Test requirements"
             )
-            self.assertFalse(result["results"][0]["success"])
-            self.assertIn("Invalid repository format", result["results"][0]["error"])
+            for repository in cases
+        ))
+        
+        for repository, result in zip(cases, results):
+            with self.subTest(repository=repository):
+                self.assertFalse(result["results"][0]["success"])
+                self.assertIn("Invalid repository format", result["results"][0]["error"])
         
-        asyncio.run(test())
         print("✅ Invalid repository format test passed")
     
-    def test_empty_requirements(self):
+    async def test_empty_requirements(self):
         """Test that empty requirements are rejected"""
-        async def test():
-            # Test empty string
-            result = await self.client.create_session(
-                session_type="implementation",
-                repository="owner/repo",
-                requirements=""
-            )
-            self.assertFalse(result["results"][0]["success"])
-            self.assertIn("Requirements cannot be empty", result["results"][0]["error"])
-            
-            # Test whitespace only
-            result = await self.client.create_session(
-                session_type="implementation",
-                repository="owner/repo",
-                requirements="   "
-            )
-            self.assertFalse(result["results"][0]["success"])
-            self.assertIn("Requirements cannot be empty", result["results"][0]["error"])
+        # Test empty string
+        result = await self.client.create_session(
+            session_type="implementation",
+            repository="owner/repo",
+            requirements=""
+        )
+        self.assertFalse(result["results"][0]["success"])
+        self.assertIn("Requirements cannot be empty", result["results"][0]["error"])
         
-        asyncio.run(test())
+        # Test whitespace only
+        result = await self.client.create_session(
+            session_type="implementation",
+            repository="owner/repo",
+            requirements="   "
+        )
+        self.assertFalse(result["results"][0]["success"])
+        self.assertIn("Requirements cannot be empty", result["results"][0]["error"])
         print("✅ Empty requirements test passed")
     
     def test_response_validation(self):
@@ -179,6 +160,581 @@ class TestClaudeOrchestrationMCP(unittest.TestCase):
         print("✅ Response validation test passed")
 
 
+def webhook_ok(data):
+    """API response for a successful webhook call"""
+    return httpx.Response(200, json={
+        "message": "Webhook processed",
+        "event": "test",
+        "handlerCount": 1,
+        "results": [{"success": True, "data": data}]
+    })
+
+
+class MockAPITestCase(unittest.IsolatedAsyncioTestCase):
+    """Base for tests that answer API requests locally through httpx.MockTransport
+    
+    Tests set self.handler(request, body) to produce responses; the event type
+    of each request (or the HTTP method for non-webhook requests) is recorded
+    in self.requests.
+    """
+    
+    async def asyncSetUp(self):
+        """Set up a client whose requests go to self.handler"""
+        self.client = ClaudeOrchestrationMCP()
+        self.requests = []
+        self.handler = None
+        
+        async def respond(request):
+            body = json.loads(request.content) if request.method == "POST" else {}
+            self.requests.append(body.get("type", request.method))
+            response = self.handler(request, body)
+            if asyncio.iscoroutine(response):
+                response = await response
+            return response
+        
+        self.client._new_client = lambda: httpx.AsyncClient(transport=httpx.MockTransport(respond))
+    
+    async def asyncTearDown(self):
+        """Close the mock client"""
+        await self.client.cleanup()
+
+
+class TestResponseCache(MockAPITestCase):
+    """Caching of read responses"""
+    
+    async def test_terminal_status_expires(self):
+        """A failed status is not kept once the session runs again elsewhere"""
+        status = {"value": "failed"}
+        self.handler = lambda request, body: webhook_ok({"session": {"id": "s1", "status": status["value"]}})
+        
+        with mock.patch.object(mcp_server, "STATUS_CACHE_TTL", 0.05):
+            first = await self.client.get_session_status("s1")
+            status["value"] = "running"
+            await asyncio.sleep(0.1)
+            second = await self.client.get_session_status("s1")
+        
+        self.assertEqual(first["results"][0]["data"]["session"]["status"], "failed")
+        self.assertEqual(second["results"][0]["data"]["session"]["status"], "running")
+        self.assertEqual(self.requests, ["session.get", "session.get"])
+    
+    async def test_invalidation_discards_inflight_response(self):
+        """A status read in flight when the session changes is not cached"""
+        release = asyncio.Event()
+        
+        async def handler(request, body):
+            await release.wait()
+            return webhook_ok({"session": {"id": "s1", "status": "completed"}})
+        
+        self.handler = handler
+        pending = asyncio.ensure_future(self.client.get_session_status("s1"))
+        await asyncio.sleep(0.01)
+        self.client._invalidate_cache("s1")
+        release.set()
+        await pending
+        await self.client.get_session_status("s1")
+        
+        self.assertEqual(self.requests, ["session.get", "session.get"])
+    
+    async def test_concurrent_reads_share_request(self):
+        """Identical reads in flight at the same time make one request"""
+        async def handler(request, body):
+            await asyncio.sleep(0.01)
+            return webhook_ok({"session": {"id": "s1", "status": "running"}})
+        
+        self.handler = handler
+        results = await asyncio.gather(*(self.client.get_session_status("s1") for _ in range(3)))
+        
+        self.assertEqual(self.requests, ["session.get"])
+        self.assertTrue(all(result == results[0] for result in results))
+    
+    async def test_cached_read_expires(self):
+        """A cached response is reused until its TTL runs out"""
+        self.handler = lambda request, body: webhook_ok({"session": {"id": "s1", "status": "running"}})
+        
+        with mock.patch.object(mcp_server, "STATUS_CACHE_TTL", 0.05):
+            await self.client.get_session_status("s1")
+            await self.client.get_session_status("s1")
+            self.assertEqual(self.requests, ["session.get"])
+            await asyncio.sleep(0.1)
+            await self.client.get_session_status("s1")
+        
+        self.assertEqual(self.requests, ["session.get", "session.get"])
+    
+    async def test_not_modified_reuses_response(self):
+        """A 304 reply returns the response stored under the ETag"""
+        sent_etags = []
+        
+        def handler(request, body):
+            sent_etags.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            response = webhook_ok({"session": {"id": "s1", "status": "running"}})
+            response.headers["ETag"] = '"v1"'
+            return response
+        
+        self.handler = handler
+        first = await self.client.get_session_status("s1")
+        self.client._invalidate_cache("s1")
+        second = await self.client.get_session_status("s1")
+        
+        self.assertEqual(sent_etags, [None, '"v1"'])
+        self.assertEqual(second, first)
+        self.assertEqual(second["results"][0]["data"]["session"]["status"], "running")
+
+class TestGetSessionsStatus(MockAPITestCase):
+    """Getting the status of several sessions at once"""
+    
+    @staticmethod
+    def status_or_missing(request, body):
+        """session.get answer where s1 is running and every other session is unknown"""
+        if body["sessionId"] == "s1":
+            return webhook_ok({"session": {"id": "s1", "status": "running"}})
+        return httpx.Response(404)
+    
+    async def test_batch_response_mapped_to_ids(self):
+        """Batch results come back in request order, with missing sessions reported"""
+        self.handler = lambda request, body: webhook_ok({"sessions": [
+            {"id": "s2", "status": "completed"},
+            {"id": "s1", "status": "running"}
+        ]})
+        
+        result = await self.client.get_sessions_status(["s1", "s2", "s3"])
+        
+        sessions = result["results"][0]["data"]["sessions"]
+        self.assertEqual([(session["id"], session.get("status")) for session in sessions[:2]], [("s1", "running"), ("s2", "completed")])
+        self.assertEqual(sessions[2], {"id": "s3", "error": "Session not found"})
+        self.assertEqual(self.requests, ["session.get_batch"])
+        self.assertTrue(self.client._batch_supported)
+    
+    async def test_falls_back_when_batch_unsupported(self):
+        """Statuses are fetched one by one, with per-session errors, when get_batch is rejected"""
+        def handler(request, body):
+            if body["type"] == "session.get_batch":
+                return httpx.Response(400)
+            return self.status_or_missing(request, body)
+        
+        self.handler = handler
+        result = await self.client.get_sessions_status(["s1", "s2"])
+        
+        sessions = result["results"][0]["data"]["sessions"]
+        self.assertEqual(sessions[0]["status"], "running")
+        self.assertEqual(sessions[1]["id"], "s2")
+        self.assertIn("error", sessions[1])
+        self.assertEqual(self.requests, ["session.get_batch", "session.get", "session.get"])
+        self.assertFalse(self.client._batch_supported)
+        
+        # The batch request is not tried again
+        self.requests.clear()
+        await self.client.get_sessions_status(["s3", "s4"])
+        self.assertEqual(self.requests, ["session.get", "session.get"])
+    
+    async def test_retryable_batch_failure_probed_again(self):
+        """A transient get_batch failure falls back without ruling the batch out"""
+        def handler(request, body):
+            if body["type"] == "session.get_batch":
+                return httpx.Response(503)
+            return self.status_or_missing(request, body)
+        
+        self.handler = handler
+        with mock.patch.object(mcp_server, "RETRY_BASE_DELAY", 0), mock.patch.object(mcp_server, "RETRY_JITTER", 0):
+            result = await self.client.get_sessions_status(["s1", "s2"])
+        
+        self.assertEqual(result["results"][0]["data"]["sessions"][0]["status"], "running")
+        self.assertEqual(self.requests[-2:], ["session.get", "session.get"])
+        self.assertIsNone(self.client._batch_supported)
+
+
+class TestCreateSessions(MockAPITestCase):
+    """Creating several sessions at once"""
+    
+    SPECS = [
+        {"session_type": "testing", "repository": "owner/repo", "requirements": "Run tests"},
+        {"session_type": "analysis", "repository": "owner/repo", "requirements": "Review code"},
+    ]
+    
+    async def test_falls_back_when_batch_unsupported(self):
+        """Sessions are created one by one when the API rejects create_batch"""
+        created = iter(["s1", "s2"])
+        
+        def handler(request, body):
+            if body["type"] == "session.create_batch":
+                return httpx.Response(400)
+            return webhook_ok({"session": {"id": next(created), "status": "pending"}})
+        
+        self.handler = handler
+        result = await self.client.create_sessions(self.SPECS)
+        
+        sessions = result["results"][0]["data"]["sessions"]
+        self.assertEqual([session["id"] for session in sessions], ["s1", "s2"])
+        self.assertEqual(self.requests, ["session.create_batch", "session.create", "session.create"])
+        self.assertFalse(self.client._create_batch_supported)
+        
+        # The batch request is not tried again
+        self.requests.clear()
+        await self.client.create_sessions(self.SPECS)
+        self.assertEqual(self.requests, ["session.create", "session.create"])
+    
+    async def test_retryable_batch_failure_not_resent(self):
+        """A batch that may have been created is not resent one session at a time"""
+        self.handler = lambda request, body: httpx.Response(503)
+        
+        with mock.patch.object(mcp_server, "RETRY_BASE_DELAY", 0), mock.patch.object(mcp_server, "RETRY_JITTER", 0):
+            result = await self.client.create_sessions(self.SPECS)
+        
+        self.assertTrue(result["results"][0]["retryable"])
+        self.assertEqual(self.requests, ["session.create_batch"])
+        self.assertIsNone(self.client._create_batch_supported)
+
+
+class TestListSessions(MockAPITestCase):
+    """Session listing"""
+    
+    async def test_filter_applied_when_api_ignores_status(self):
+        """Every filtered list is checked locally, even after one that already matched"""
+        sessions = [{"id": "a", "status": "running"}]
+        self.handler = lambda request, body: webhook_ok({"sessions": sessions})
+        
+        running = await self.client.list_sessions("running")
+        sessions = [{"id": "a", "status": "running"}, {"id": "b", "status": "completed"}]
+        failed = await self.client.list_sessions("failed")
+        
+        self.assertEqual([s["id"] for s in running["results"][0]["data"]["sessions"]], ["a"])
+        self.assertEqual(failed["results"][0]["data"]["sessions"], [])
+
+
+class TestWaitForSession(MockAPITestCase):
+    """Waiting for sessions to finish"""
+    
+    async def test_joiner_outlives_starter(self):
+        """A second waiter with a longer timeout still gets the result after the first times out"""
+        loop = asyncio.get_running_loop()
+        completes_at = loop.time() + 1.5
+        
+        def handler(request, body):
+            status = "completed" if loop.time() >= completes_at else "running"
+            session = {"id": "s1", "status": status}
+            if status == "completed":
+                session["output"] = {"summary": "done"}
+            return webhook_ok({"session": session})
+        
+        self.handler = handler
+        starter = asyncio.ensure_future(self.client.wait_for_session("s1", timeout_seconds=1, poll_interval_seconds=1))
+        await asyncio.sleep(0.05)
+        joiner = asyncio.ensure_future(self.client.wait_for_session("s1", timeout_seconds=3, poll_interval_seconds=1))
+        starter_result, joiner_result = await asyncio.gather(starter, joiner)
+        
+        self.assertFalse(starter_result["results"][0]["success"])
+        self.assertEqual(starter_result["results"][0]["error"], "Session s1 did not complete within 1 seconds")
+        self.assertTrue(joiner_result["results"][0]["success"])
+        self.assertEqual(joiner_result["results"][0]["data"]["status"], "completed")
+        self.assertEqual(joiner_result["results"][0]["data"]["output"]["summary"], "done")
+    
+    async def test_events_not_requested_without_url(self):
+        """Without CLAUDE_HUB_EVENTS_URL only the webhook is used"""
+        self.client.events_url = ""
+        self.handler = lambda request, body: webhook_ok({"session": {"id": "s1", "status": "failed"}})
+        
+        result = await self.client.wait_for_session("s1", timeout_seconds=5, poll_interval_seconds=1)
+        
+        self.assertEqual(result["results"][0]["data"]["status"], "failed")
+        self.assertEqual(self.requests, ["session.get"])
+    
+    async def test_idle_event_stream_falls_back_to_polling(self):
+        """A stream that never sends status events hands over to polling"""
+        self.client.events_url = "http://hub.test/sessions/{session_id}/events"
+        
+        async def pings():
+            while True:
+                yield b"event: ping\ndata: {}\n\n"
+                await asyncio.sleep(0.02)
+        
+        def handler(request, body):
+            if request.method == "GET":
+                self.assertEqual(str(request.url), "http://hub.test/sessions/s1/events")
+                return httpx.Response(200, headers={"Content-Type": "text/event-stream"}, content=pings())
+            return webhook_ok({"session": {"id": "s1", "status": "failed"}})
+        
+        self.handler = handler
+        with mock.patch.object(mcp_server, "EVENTS_IDLE_TIMEOUT", 0.1):
+            result = await asyncio.wait_for(
+                self.client.wait_for_session("s1", timeout_seconds=30, poll_interval_seconds=1), 5
+            )
+        
+        self.assertEqual(result["results"][0]["data"]["status"], "failed")
+        self.assertEqual(self.requests, ["GET", "session.get"])
+    
+    async def test_long_poll_request(self):
+        """A status read with wait_seconds asks the server to hold it and include terminal output"""
+        sent = []
+        
+        def handler(request, body):
+            sent.append((body, request.extensions["timeout"]["read"]))
+            return webhook_ok({"session": {"id": "s1", "status": "running"}})
+        
+        self.handler = handler
+        await self.client.get_session_status("s1", wait_seconds=2)
+        
+        (body, read_timeout), = sent
+        self.assertEqual(body["waitMs"], 2000)
+        self.assertTrue(body["includeOutputOnTerminal"])
+        self.assertAlmostEqual(read_timeout, 2 + mcp_server.LONG_POLL_GRACE_SECONDS, places=1)
+    
+    async def test_inline_output_skips_output_request(self):
+        """Output carried by the terminal status is used without a session.output request"""
+        self.handler = lambda request, body: webhook_ok({"session": {
+            "id": "s1", "status": "completed", "output": {"summary": "inline"}
+        }})
+        
+        result = await self.client.wait_for_session("s1", timeout_seconds=5)
+        
+        self.assertEqual(result["results"][0]["data"]["output"]["summary"], "inline")
+        self.assertEqual(self.requests, ["session.get"])
+    
+    async def test_output_requested_when_not_inline(self):
+        """A completed status without output is followed by a session.output request"""
+        def handler(request, body):
+            session = {"id": "s1", "status": "completed"}
+            if body["type"] == "session.output":
+                session["output"] = {"summary": "fetched"}
+            return webhook_ok({"session": session})
+        
+        self.handler = handler
+        result = await self.client.wait_for_session("s1", timeout_seconds=5)
+        
+        self.assertEqual(result["results"][0]["data"]["output"]["summary"], "fetched")
+        self.assertEqual(self.requests, ["session.get", "session.output"])
+    
+    async def test_backoff_stops_at_deadline(self):
+        """Neither the long poll nor the sleep between polls runs past the timeout"""
+        wait_ms = []
+        
+        def handler(request, body):
+            wait_ms.append(body["waitMs"])
+            return webhook_ok({"session": {"id": "s1", "status": "running"}})
+        
+        self.handler = handler
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        with mock.patch.object(mcp_server, "POLL_INITIAL_INTERVAL", 5):
+            result = await self.client.wait_for_session("s1", timeout_seconds=0.3, poll_interval_seconds=10)
+        
+        self.assertLess(loop.time() - started, 1)
+        self.assertFalse(result["results"][0]["success"])
+        self.assertTrue(all(ms <= 300 for ms in wait_ms))
+
+
+class TestWaitForSessions(MockAPITestCase):
+    """Waiting for several sessions to finish"""
+    
+    async def test_unlisted_session_fails_fast(self):
+        """An ID the list doesn't show is looked up, and an unknown one fails at once"""
+        def handler(request, body):
+            if body["type"] == "session.list":
+                return webhook_ok({"sessions": [{"id": "s1", "status": "running"}]})
+            return httpx.Response(404)
+        
+        self.handler = handler
+        result = await asyncio.wait_for(
+            self.client.wait_for_sessions(["s1", "typo"], timeout_seconds=30, poll_interval_seconds=1), 5
+        )
+        
+        self.assertFalse(result["results"][0]["success"])
+        self.assertEqual(self.requests, ["session.list", "session.get"])
+    
+    async def test_unlisted_session_tracked_by_status(self):
+        """A session missing from the list finishes through its own status"""
+        def handler(request, body):
+            if body["type"] == "session.list":
+                return webhook_ok({"sessions": [{"id": "s1", "status": "failed"}]})
+            return webhook_ok({"session": {"id": "s2", "status": "failed"}})
+        
+        self.handler = handler
+        result = await self.client.wait_for_sessions(["s1", "s2"], timeout_seconds=5, poll_interval_seconds=1)
+        
+        sessions = result["results"][0]["data"]["sessions"]
+        self.assertEqual([(session["sessionId"], session["status"]) for session in sessions], [("s1", "failed"), ("s2", "failed")])
+    
+    async def test_retryable_list_failure_ridden_out(self):
+        """A transient list failure doesn't end the wait"""
+        failures = [httpx.Response(503)] * mcp_server.RETRY_ATTEMPTS
+        
+        def handler(request, body):
+            if failures:
+                return failures.pop()
+            return webhook_ok({"sessions": [{"id": "s1", "status": "failed"}]})
+        
+        self.handler = handler
+        with mock.patch.object(mcp_server, "RETRY_BASE_DELAY", 0), mock.patch.object(mcp_server, "RETRY_JITTER", 0):
+            result = await self.client.wait_for_sessions(["s1"], timeout_seconds=5, poll_interval_seconds=1)
+        
+        self.assertTrue(result["results"][0]["success"])
+        self.assertEqual(self.requests, ["session.list"] * (mcp_server.RETRY_ATTEMPTS + 1))
+    
+    async def test_sessions_finish_across_polls(self):
+        """Sessions finishing on different polls are collected, with output only for completed ones"""
+        polls = iter([
+            [("s1", "running"), ("s2", "running")],
+            [("s1", "completed"), ("s2", "running")],
+            [("s1", "completed"), ("s2", "failed")],
+        ])
+        
+        def handler(request, body):
+            if body["type"] == "session.list":
+                return webhook_ok({"sessions": [{"id": sid, "status": status} for sid, status in next(polls)]})
+            return webhook_ok({"session": {"id": body["sessionId"], "status": "completed", "output": {"summary": "done"}}})
+        
+        self.handler = handler
+        with mock.patch.object(mcp_server, "POLL_INITIAL_INTERVAL", 0.01):
+            result = await self.client.wait_for_sessions(["s1", "s2"], timeout_seconds=5, poll_interval_seconds=1)
+        
+        s1, s2 = result["results"][0]["data"]["sessions"]
+        self.assertEqual((s1["status"], s1["output"]["summary"]), ("completed", "done"))
+        self.assertEqual((s2["status"], s2["error"]), ("failed", "Session failed"))
+        self.assertNotIn("output", s2)
+        self.assertEqual(self.requests, ["session.list"] * 3 + ["session.output"])
+    
+    async def test_timeout_lists_pending_sessions(self):
+        """A wait that runs out of time names the sessions still pending"""
+        self.handler = lambda request, body: webhook_ok({"sessions": [
+            {"id": "s1", "status": "completed"},
+            {"id": "s2", "status": "running"},
+            {"id": "s3", "status": "queued"}
+        ]})
+        
+        result = await self.client.wait_for_sessions(["s1", "s2", "s3"], timeout_seconds=0.3, poll_interval_seconds=1)
+        
+        first_result = result["results"][0]
+        self.assertFalse(first_result["success"])
+        self.assertEqual(first_result["error"], "Sessions s2, s3 did not complete within 0.3 seconds")
+        self.assertEqual(first_result["data"]["sessions"], [{"sessionId": "s1", "status": "completed"}])
+        self.assertNotIn("session.output", self.requests)
+    
+    async def test_tool_parses_ids(self):
+        """The tool splits its comma-separated IDs and is offered in the UI"""
+        self.handler = lambda request, body: webhook_ok({"sessions": [
+            {"id": "s1", "status": "failed"},
+            {"id": "s2", "status": "failed"}
+        ]})
+        
+        with mock.patch.object(mcp_server, "orchestration", self.client):
+            try:
+                result = json.loads(await mcp_server.wait_for_sessions_sync("s1, s2,", timeout_seconds=5))
+            finally:
+                await mcp_server._on_loop(self.client.cleanup())
+        
+        self.assertEqual([session["sessionId"] for session in result["results"][0]["data"]["sessions"]], ["s1", "s2"])
+        self.assertIn(mcp_server.wait_for_sessions_sync, [tab[2] for tab in mcp_server.GRADIO_TABS])
+
+
+def status_error(status_code, headers=None):
+    """HTTPStatusError for a response with the given status"""
+    request = httpx.Request("POST", "http://hub.test/")
+    response = httpx.Response(status_code, headers=headers, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+class TestRequestSlots(MockAPITestCase):
+    """Limiting concurrent API requests"""
+    
+    async def test_long_poll_does_not_take_slot(self):
+        """Other calls are not queued behind a long poll"""
+        release = asyncio.Event()
+        
+        async def handler(request, body):
+            if "waitMs" in body:
+                await release.wait()
+                return webhook_ok({"session": {"id": "s1", "status": "completed"}})
+            return webhook_ok({"session": {"id": "s2", "status": "pending"}})
+        
+        self.handler = handler
+        self.client.max_inflight = 1
+        poll = asyncio.ensure_future(self.client.get_session_status("s1", wait_seconds=5))
+        await asyncio.sleep(0.01)
+        
+        result = await asyncio.wait_for(
+            self.client.create_session("testing", "owner/repo", "Run tests"), timeout=1
+        )
+        release.set()
+        await poll
+        
+        self.assertEqual(result["results"][0]["data"]["session"]["id"], "s2")
+
+
+class TestRetries(MockAPITestCase):
+    """Resending requests after failures"""
+    
+    def test_retry_classification(self):
+        """Reads are resent after transient failures; writes only when never sent"""
+        connect_error = httpx.ConnectError("refused")
+        self.assertIsNotNone(mcp_server._retry_delay(connect_error, 0, idempotent=False))
+        self.assertIsNotNone(mcp_server._retry_delay(status_error(503), 0, idempotent=True))
+        self.assertIsNotNone(mcp_server._retry_delay(status_error(429), 0, idempotent=True))
+        self.assertIsNone(mcp_server._retry_delay(status_error(503), 0, idempotent=False))
+        self.assertIsNone(mcp_server._retry_delay(status_error(400), 0, idempotent=True))
+    
+    def test_retry_after_honoured(self):
+        """A Retry-After header lengthens the delay, up to RETRY_MAX_DELAY"""
+        delay = mcp_server._retry_delay(status_error(429, {"Retry-After": "7"}), 0, idempotent=True)
+        self.assertGreaterEqual(delay, 7)
+        delay = mcp_server._retry_delay(status_error(429, {"Retry-After": "3600"}), 0, idempotent=True)
+        self.assertLessEqual(delay, mcp_server.RETRY_MAX_DELAY)
+    
+    async def test_read_resent_after_server_error(self):
+        """A status read succeeds once the API recovers"""
+        responses = [httpx.Response(503), httpx.Response(503)]
+        self.handler = lambda request, body: (
+            responses.pop(0) if responses else webhook_ok({"session": {"id": "s1", "status": "running"}})
+        )
+        
+        with mock.patch.object(mcp_server, "RETRY_BASE_DELAY", 0), mock.patch.object(mcp_server, "RETRY_JITTER", 0):
+            result = await self.client.get_session_status("s1")
+        
+        self.assertTrue(result["results"][0]["success"])
+        self.assertEqual(self.requests, ["session.get"] * 3)
+    
+    async def test_write_not_resent_after_server_error(self):
+        """A start the server may have seen is reported as retryable, not resent"""
+        self.handler = lambda request, body: httpx.Response(503)
+        
+        with mock.patch.object(mcp_server, "RETRY_BASE_DELAY", 0), mock.patch.object(mcp_server, "RETRY_JITTER", 0):
+            result = await self.client.start_session("s1")
+        
+        self.assertFalse(result["results"][0]["success"])
+        self.assertTrue(result["results"][0]["retryable"])
+        self.assertEqual(self.requests, ["session.start"])
+    
+    async def test_write_resent_after_connect_error(self):
+        """A create that never reached the server is sent again"""
+        failures = [httpx.ConnectError("refused")]
+        
+        def handler(request, body):
+            if failures:
+                raise failures.pop()
+            return webhook_ok({"session": {"id": "s1", "status": "pending"}})
+        
+        self.handler = handler
+        with mock.patch.object(mcp_server, "RETRY_BASE_DELAY", 0), mock.patch.object(mcp_server, "RETRY_JITTER", 0):
+            result = await self.client.create_session("testing", "owner/repo", "Run tests")
+        
+        self.assertEqual(result["results"][0]["data"]["session"]["id"], "s1")
+        self.assertEqual(self.requests, ["session.create", "session.create"])
+    
+    async def test_long_poll_read_timeout_not_resent(self):
+        """A long poll that timed out is not repeated past its own timeout"""
+        async def handler(request, body):
+            # Behave like a server that holds the request past the client's timeout
+            await asyncio.sleep(request.extensions["timeout"]["read"])
+            raise httpx.ReadTimeout("timed out", request=request)
+        
+        self.handler = handler
+        with mock.patch.object(mcp_server, "LONG_POLL_GRACE_SECONDS", 0.1), \
+                mock.patch.object(mcp_server, "RETRY_BASE_DELAY", 0), mock.patch.object(mcp_server, "RETRY_JITTER", 0):
+            result = await self.client.get_session_status("s1", wait_seconds=0.1)
+        
+        self.assertTrue(result["results"][0]["retryable"])
+        self.assertEqual(self.requests, ["session.get"])
+
+
 if __name__ == "__main__":
     print("Running simple unit tests...")
     print("=" * 40)